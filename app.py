@@ -1,12 +1,15 @@
 """Campaign Analytics Lab — main Streamlit entry point."""
+import json
 import os
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import date
 
-from config import PROFILES_PATH, YEARLY_KPI_PATH, DATASET_PATH, LOGO_PATH
+from config import LOGO_PATH, CSS_PATH
+from engine.data_store import load_profiles, load_yearly_kpis, load_transactions
 from engine.dna import (
+    build_profile_store,
     compute_similarity_weights,
     build_pure_dna,
     build_year_dataframe,
@@ -35,11 +38,10 @@ _ORANGE = "#F47920"
 _BLACK  = "#111111"
 
 # ─── LOGO ──────────────────────────────────────────────────────────────────────
-_LOGO_EXISTS = os.path.exists(LOGO_PATH)
-
-
+@st.cache_resource
 def _logo_b64() -> str:
-    if not _LOGO_EXISTS:
+    """Read + base64-encode the logo once per process, not on every rerun."""
+    if not os.path.exists(LOGO_PATH):
         return ""
     import base64
     with open(LOGO_PATH, "rb") as f:
@@ -48,248 +50,39 @@ def _logo_b64() -> str:
 _LOGO_B64 = _logo_b64()
 
 # ─── GLOBAL CSS ────────────────────────────────────────────────────────────────
-_CSS = f"""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-:root {{
-    --orange:  {_ORANGE};
-    --black:   {_BLACK};
-    --bg:      #F8F8F8;
-    --surface: #FFFFFF;
-    --border:  #EFEFEF;
-    --text-1:  #111111;
-    --text-2:  #555555;
-    --text-3:  #AAAAAA;
-    --radius:  10px;
-    --shadow:  0 1px 12px rgba(0,0,0,0.06);
-    --shadow-hover: 0 4px 20px rgba(0,0,0,0.10);
-}}
+@st.cache_resource
+def _css() -> str:
+    """Read assets/app.css once per process; injected on every authenticated rerun."""
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
 
-h1,h2,h3,h4,h5,h6,p,label,
-.stMarkdown,.stCaption,
-[data-baseweb="tab"],
-[data-testid="stMetricLabel"],
-[data-testid="stMetricValue"],
-[data-testid="stMetricDelta"] {{
-    font-family: 'Inter', sans-serif;
-}}
-
-[data-testid="stAppViewContainer"] {{ background: var(--bg); }}
-
-@media (min-width: 768px) {{
-    [data-testid="stHeader"] {{ display: none !important; }}
-}}
-@media (max-width: 767px) {{
-    [data-testid="stHeader"] {{
-        background: var(--surface) !important;
-        border-bottom: 1px solid var(--border) !important;
-    }}
-    [data-testid="stToolbar"] {{ display: none !important; }}
-}}
-
-.main .block-container {{
-    padding-top: 2.5rem;
-    padding-left: 2.5rem;
-    padding-right: 2.5rem;
-}}
-@media (max-width: 767px) {{
-    .main .block-container {{
-        padding-top: 4rem;
-        padding-left: 1rem;
-        padding-right: 1rem;
-    }}
-}}
-
-section[data-testid="stSidebar"],
-section[data-testid="stSidebar"] > div:first-child {{
-    background: var(--surface);
-    border-right: 1px solid var(--border);
-}}
-section[data-testid="stSidebar"] p           {{ color: var(--text-2); font-size: 0.82rem; }}
-section[data-testid="stSidebar"] label       {{ color: var(--text-1); font-size: 0.85rem; }}
-section[data-testid="stSidebar"] .stCaption  {{ color: var(--text-3); font-size: 0.78rem; }}
-section[data-testid="stSidebar"] h2,
-section[data-testid="stSidebar"] h3 {{
-    color: var(--text-3) !important;
-    font-size: 0.6rem !important;
-    font-weight: 700 !important;
-    text-transform: uppercase;
-    letter-spacing: 0.14em;
-    margin: 6px 0 2px;
-}}
-section[data-testid="stSidebar"] hr {{ border-color: var(--border); margin: 8px 0; }}
-/* ── Sidebar nav buttons — flat, left-aligned ── */
-[data-testid="stSidebar"] [data-testid="baseButton-secondary"] {{
-    background:    transparent !important;
-    border:        none !important;
-    box-shadow:    none !important;
-    text-align:    left !important;
-    padding:       7px 10px !important;
-    color:         #555555 !important;
-    font-size:     0.84rem !important;
-    font-weight:   400 !important;
-    font-family:   'Inter', sans-serif !important;
-    border-radius: 7px !important;
-    width:         100%;
-    transition:    background 0.15s, color 0.15s !important;
-    margin:        1px 0 !important;
-}}
-[data-testid="stSidebar"] [data-testid="baseButton-secondary"]:hover {{
-    background: rgba(26,26,107,0.07) !important;
-    color:      #1a1a6b !important;
-    border:     none !important;
-}}
-.nav-active {{
-    display:       block;
-    background:    rgba(26,26,107,0.09);
-    border-left:   3px solid #1a1a6b;
-    border-radius: 0 7px 7px 0;
-    color:         #1a1a6b;
-    font-family:   'Inter', sans-serif;
-    font-size:     0.84rem;
-    font-weight:   600;
-    padding:       7px 10px 7px 7px;
-    margin:        1px 0;
-    cursor:        default;
-}}
-.nav-section {{
-    display:        block;
-    font-family:    'Inter', sans-serif;
-    font-size:      0.62rem;
-    font-weight:    700;
-    color:          #BBBBBB;
-    letter-spacing: 0.08em;
-    text-transform: uppercase;
-    padding:        12px 10px 5px;
-}}
-
-[data-baseweb="tab-list"] {{
-    background: transparent !important;
-    border-radius: 0 !important;
-    gap: 0 !important;
-    padding: 0 !important;
-    border-bottom: 1px solid var(--border) !important;
-}}
-[data-baseweb="tab"] {{
-    border-radius: 0 !important;
-    background: transparent !important;
-    padding: 10px 20px !important;
-    color: var(--text-3) !important;
-    font-weight: 500 !important;
-    font-size: 0.88rem !important;
-    border-bottom: 2px solid transparent !important;
-    margin-bottom: -1px !important;
-    transition: color 0.15s !important;
-}}
-[data-baseweb="tab"]:hover {{ color: var(--text-2) !important; }}
-[aria-selected="true"] {{
-    background: transparent !important;
-    color: var(--orange) !important;
-    border-bottom: 2px solid var(--orange) !important;
-}}
-
-[data-testid="stMetric"] {{
-    background: var(--surface);
-    border-radius: var(--radius);
-    border: 1px solid var(--border);
-    border-left: 3px solid var(--orange);
-    box-shadow: var(--shadow);
-    padding: 20px 22px;
-    transition: box-shadow 0.2s, transform 0.2s;
-}}
-[data-testid="stMetric"]:hover {{
-    box-shadow: var(--shadow-hover);
-    transform: translateY(-1px);
-}}
-[data-testid="stMetricLabel"] {{
-    color: var(--text-3) !important;
-    font-size: 0.65rem !important;
-    font-weight: 700 !important;
-    text-transform: uppercase;
-    letter-spacing: 0.1em;
-    margin-bottom: 4px;
-}}
-[data-testid="stMetricValue"] {{
-    color: var(--black) !important;
-    font-weight: 700 !important;
-    line-height: 1.2 !important;
-}}
-
-[data-testid="baseButton-primary"],
-[data-testid="baseButton-primaryFormSubmit"] {{
-    background: var(--orange) !important;
-    color: #FFFFFF !important;
-    border: none !important;
-    border-radius: 8px !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.01em !important;
-    transition: opacity 0.15s, transform 0.15s !important;
-}}
-[data-testid="baseButton-primary"]:hover,
-[data-testid="baseButton-primaryFormSubmit"]:hover {{
-    opacity: 0.88 !important;
-    transform: translateY(-1px) !important;
-}}
-
-[data-testid="baseButton-secondary"],
-[data-testid="baseButton-secondaryFormSubmit"] {{
-    background: #FFFFFF !important;
-    color: var(--text-1) !important;
-    border: 1px solid #DEDEDE !important;
-    border-radius: 8px !important;
-    font-weight: 500 !important;
-}}
-[data-testid="baseButton-secondary"]:hover,
-[data-testid="baseButton-secondaryFormSubmit"]:hover {{
-    border-color: #BBBBBB !important;
-    background: #FAFAFA !important;
-}}
-
-[data-testid="stDownloadButton"] > button {{
-    background: var(--orange) !important;
-    color: #FFFFFF !important;
-    border: none !important;
-    border-radius: 8px !important;
-    font-weight: 600 !important;
-}}
-[data-testid="stDownloadButton"] > button:hover {{ opacity: 0.88 !important; }}
-
-input[type="text"]:focus,
-input[type="number"]:focus,
-input[type="password"]:focus,
-textarea:focus {{
-    border-color: var(--orange) !important;
-    box-shadow: 0 0 0 2px rgba(244,121,32,0.15) !important;
-    outline: none !important;
-}}
-
-[data-testid="stFileUploadDropzone"] {{
-    border: 2px dashed #E0E0E0;
-    border-radius: var(--radius);
-    background: #FAFAFA;
-}}
-[data-testid="stFileUploadDropzone"]:hover {{
-    border-color: var(--orange);
-    background: #FFF8F4;
-}}
-
-[data-testid="stExpander"] {{
-    background: var(--surface);
-    border: 1px solid var(--border) !important;
-    border-radius: var(--radius) !important;
-}}
-
-[data-testid="stAlert"] {{ border-radius: 8px; }}
-
-/* ── Fixed sidebar: hide collapse button (prevent collapsing) ── */
-[data-testid="stSidebarCollapseButton"] {{ display: none !important; }}
-</style>
-"""
+# ─── SESSION STATE ─────────────────────────────────────────────────────────────
+_SESSION_DEFAULTS = {
+    "_auth_ok":         False,
+    "_user_name":       "",
+    "nav_page":         "dashboard",
+    "event_log":        [],
+    "shock_library":    [],
+    "shift_target_idx": None,
+    "tgt_start":        date(2025, 1, 1),
+    "tgt_end":          date(2025, 12, 31),
+    "target_metric":    "Revenue",
+    "target_val":       100_000.0,
+    "ui_res_level":     "Monthly",
+    "ui_t_start":       date(2025, 8, 1),
+    "ui_t_end":         date(2025, 8, 31),
+    "ui_s_val":         10_000.0,
+    "ui_conv_val":      200.0,
+    "ui_rev_val":       20_000.0,
+    "ui_adj_s":         0.0,
+    "ui_adj_conv":      0.0,
+    "ui_adj_rev":       0.0,
+    "ui_sel_brands":    [],
+}
+for _k, _v in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_k, _v)
 
 # ─── AUTH GATE ─────────────────────────────────────────────────────────────────
-if "_auth_ok"   not in st.session_state: st.session_state._auth_ok   = False
-if "_user_name" not in st.session_state: st.session_state._user_name = ""
 
 if not st.session_state._auth_ok:
     st.markdown(f"""
@@ -369,41 +162,42 @@ footer                    {{ display: none !important; }}
     st.stop()
 
 # ─── INJECT GLOBAL CSS ─────────────────────────────────────────────────────────
-st.markdown(_CSS, unsafe_allow_html=True)
-
-# ─── SESSION STATE ─────────────────────────────────────────────────────────────
-if "event_log"        not in st.session_state: st.session_state.event_log        = []
-if "shock_library"    not in st.session_state: st.session_state.shock_library    = []
-if "shift_target_idx" not in st.session_state: st.session_state.shift_target_idx = None
-if "tgt_start"        not in st.session_state: st.session_state.tgt_start        = date(2025, 1, 1)
-if "tgt_end"          not in st.session_state: st.session_state.tgt_end          = date(2025, 12, 31)
-if "target_metric"    not in st.session_state: st.session_state.target_metric    = "Revenue"
-if "target_val"       not in st.session_state: st.session_state.target_val       = 100_000.0
-if "ui_res_level"     not in st.session_state: st.session_state.ui_res_level     = "Monthly"
-if "ui_t_start"       not in st.session_state: st.session_state.ui_t_start       = date(2025, 8, 1)
-if "ui_t_end"         not in st.session_state: st.session_state.ui_t_end         = date(2025, 8, 31)
-if "ui_s_val"         not in st.session_state: st.session_state.ui_s_val         = 10_000.0
-if "ui_conv_val"      not in st.session_state: st.session_state.ui_conv_val      = 200.0
-if "ui_rev_val"       not in st.session_state: st.session_state.ui_rev_val       = 20_000.0
-if "ui_adj_s"         not in st.session_state: st.session_state.ui_adj_s         = 0.0
-if "ui_adj_conv"      not in st.session_state: st.session_state.ui_adj_conv      = 0.0
-if "ui_adj_rev"       not in st.session_state: st.session_state.ui_adj_rev       = 0.0
-if "ui_sel_brands"    not in st.session_state: st.session_state.ui_sel_brands    = []
+st.markdown(_css(), unsafe_allow_html=True)
 
 # ─── DATA LOADING ──────────────────────────────────────────────────────────────
-@st.cache_data
+# cache_resource: one shared copy per process, no pickle/hash/copy per rerun.
+# The returned frames are read-only — filter/copy them, never mutate in place.
+@st.cache_resource(show_spinner=False)
 def load_data():
-    profiles    = pd.read_csv(PROFILES_PATH)
-    profiles["Year"] = profiles["Year"].astype(str)
-    yearly_kpis = pd.read_csv(YEARLY_KPI_PATH)
-    df_raw      = pd.read_csv(DATASET_PATH)
-    df_raw["Date"]  = pd.to_datetime(df_raw["Date"])
-    df_raw["brand"] = df_raw["brand"].str.strip().str.lower()
-    return profiles, yearly_kpis, df_raw
+    profiles = load_profiles()
+    return profiles, build_profile_store(profiles), load_yearly_kpis(), load_transactions()
+
+profiles, profile_store, yearly_kpis, df_raw = load_data()
+
 
-profiles, yearly_kpis, df_raw = load_data()
+@st.cache_data(max_entries=64, show_spinner=False)
+def _run_projection(sel_brands, proj_year, t_start, t_end, s_val, conv_val, rev_val,
+                    adj_s, adj_conv, adj_rev, event_log_key, _event_log):
+    """DNA blend → calibration → projections, cached on the inputs that drive them.
 
-data_years  = sorted([int(y) for y in profiles["Year"].unique() if y != "Overall"])
+    `event_log_key` is a JSON dump of `_event_log` and stands in for it in the cache
+    key (leading-underscore args are not hashed). Returns
+    (norm_weights, pure_dna, df, (base_sessions, base_cr, base_aov)); the projection
+    columns are only added when calibration succeeds.
+    """
+    sel_brands   = list(sel_brands)
+    norm_weights = compute_similarity_weights(
+        profile_store, sel_brands, proj_year, t_start, t_end, s_val, conv_val, rev_val)
+    pure_dna = build_pure_dna(profile_store, sel_brands, norm_weights)
+    df, _    = build_year_dataframe(int(proj_year))
+    build_dna_layers(df, pure_dna, _event_log)
+
+    base = calibrate_base(df, t_start, t_end, adj_s, adj_conv, adj_rev)
+    if base[0] is not None:
+        build_projections(df, *base, _event_log)
+    return norm_weights, pure_dna, df, base
+
+data_years  = sorted(int(y) for y in profiles["Year"].cat.categories if y != "Overall")
 min_data_yr = data_years[0]
 max_data_yr = data_years[-1]
 
@@ -431,9 +225,6 @@ st.sidebar.markdown(
 st.sidebar.divider()
 
 # ── Navigation ─────────────────────────────────────────────────────────────────
-if "nav_page" not in st.session_state:
-    st.session_state.nav_page = "dashboard"
-
 _NAV_MAP = {
     "dashboard": ("📊", "Dashboard"),
     "lab":       ("⚡", "Simulation Lab"),
@@ -484,13 +275,15 @@ if _is_analytics:
     if not st.session_state.ui_sel_brands:
         st.session_state.ui_sel_brands = list(all_brands)
     select_all = st.sidebar.checkbox("All entities", value=True)
-    sel_brands = []
-    for b in all_brands:
-        chk = st.sidebar.checkbox(
-            b.title(), value=(select_all or b in st.session_state.ui_sel_brands),
-            disabled=select_all, key=f"chk_{b}")
-        if select_all or chk:
-            sel_brands.append(b)
+    if select_all:
+        sel_brands = list(all_brands)
+    else:
+        if "ms_brands" not in st.session_state:
+            st.session_state.ms_brands = [
+                b for b in st.session_state.ui_sel_brands if b in all_brands]
+        sel_brands = st.sidebar.multiselect(
+            "Entities", all_brands, key="ms_brands",
+            format_func=str.title, label_visibility="collapsed")
     st.session_state.ui_sel_brands = sel_brands
 
     if not sel_brands:
@@ -516,13 +309,21 @@ if _is_analytics:
         st.number_input("Conversions adj (%)", -100.0, 500.0, key="ui_adj_conv", step=5.0)
         st.number_input("Revenue adj (%)",     -100.0, 500.0, key="ui_adj_rev",  step=5.0)
 
-    adj_s    = s_val    / (1 + st.session_state.ui_adj_s    / 100) if (1 + st.session_state.ui_adj_s    / 100) != 0 else s_val
-    adj_conv = conv_val / (1 + st.session_state.ui_adj_conv / 100) if (1 + st.session_state.ui_adj_conv / 100) != 0 else conv_val
-    adj_rev  = rev_val  / (1 + st.session_state.ui_adj_rev  / 100) if (1 + st.session_state.ui_adj_rev  / 100) != 0 else rev_val
-
-    proj_year    = str(t_start.year)
-    norm_weights = compute_similarity_weights(
-        profiles, sel_brands, proj_year, t_start, t_end, s_val, conv_val, rev_val)
+    # Strip the pre-adjustment lift; a −100% adjustment (zero denominator) keeps the raw value.
+    raw   = np.array([s_val, conv_val, rev_val], dtype=float)
+    denom = 1 + np.array([st.session_state.ui_adj_s,
+                          st.session_state.ui_adj_conv,
+                          st.session_state.ui_adj_rev]) / 100
+    adj_s, adj_conv, adj_rev = np.divide(raw, denom, out=raw.copy(), where=denom != 0).tolist()
+
+    proj_year = str(t_start.year)
+    event_log = st.session_state.event_log
+    # Everything the projection depends on; also keys the dashboard's cached aggregations.
+    proj_key  = (tuple(sel_brands), proj_year, t_start, t_end, s_val, conv_val, rev_val,
+                 adj_s, adj_conv, adj_rev,
+                 json.dumps(event_log, default=str, sort_keys=True))
+    norm_weights, pure_dna, df, (base_sessions, base_cr, base_aov) = _run_projection(
+        *proj_key, event_log)
 
     st.sidebar.divider()
     st.sidebar.header("DNA Weights")
@@ -530,18 +331,10 @@ if _is_analytics:
     for y, w in norm_weights.items():
         st.sidebar.caption(f"{w * 65.0:.1f}% — {y}")
 
-    pure_dna       = build_pure_dna(profiles, sel_brands, norm_weights)
-    df, _full_year = build_year_dataframe(int(proj_year))
-    build_dna_layers(df, pure_dna, st.session_state.event_log)
-
-    base_sessions, base_cr, base_aov = calibrate_base(
-        df, t_start, t_end, adj_s, adj_conv, adj_rev)
     if base_sessions is None:
         st.error("Trial date range yields zero DNA sum. Widen the trial period.")
         st.stop()
 
-    build_projections(df, base_sessions, base_cr, base_aov, st.session_state.event_log)
-
     st.sidebar.divider()
     st.sidebar.header("Export")
 
@@ -549,40 +342,51 @@ if _is_analytics:
     try:
         import io
         from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
         from openpyxl.styles import Font, PatternFill, Alignment
-        import openpyxl.utils
-
-        def _build_excel(df_exp):
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Projections"
-            cols = [
-                "Date", "Sessions_Base", "Sessions_Sim",
-                "Conversions_Base", "Conversions_Sim",
-                "Revenue_Base", "Revenue_Sim",
-            ]
+
+        _xl_cols = [
+            "Date", "Sessions_Base", "Sessions_Sim",
+            "Conversions_Base", "Conversions_Sim",
+            "Revenue_Base", "Revenue_Sim",
+        ]
+
+        def _build_excel(df_exp, cols=_xl_cols):
+            # write_only streams rows straight to XML instead of keeping a cell grid.
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Projections")
             hdr = Font(bold=True, color="FFFFFF")
             fill = PatternFill("solid", fgColor="1A1A6B")
-            for ci, c in enumerate(cols, 1):
-                cell = ws.cell(1, ci, c)
+            header = []
+            for c in cols:
+                cell = WriteOnlyCell(ws, value=c)
                 cell.font = hdr
                 cell.fill = fill
                 cell.alignment = Alignment(horizontal="center")
-            for ri, row in df_exp[cols].iterrows():
-                for ci, v in enumerate(row, 1):
-                    ws.cell(ri + 2, ci, v)
+                header.append(cell)
+            ws.append(header)
+            for row in df_exp[cols].itertuples(index=False, name=None):
+                ws.append(row)
             buf = io.BytesIO()
             wb.save(buf)
             return buf.getvalue()
 
-        xl = _build_excel(df)
-        st.sidebar.download_button(
-            "Download Strategy Report",
-            data=xl,
-            file_name=f"strategy_{proj_year}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True,
-        )
+        # Build the workbook only on request; drop it once the projection changes.
+        xl_sig = int(pd.util.hash_pandas_object(df[_xl_cols], index=False).sum())
+        if st.session_state.get("_xl_sig") != xl_sig:
+            st.session_state.pop("_xl_bytes", None)
+        if "_xl_bytes" not in st.session_state:
+            if st.sidebar.button("Prepare Strategy Report", use_container_width=True):
+                st.session_state._xl_bytes = _build_excel(df)
+                st.session_state._xl_sig   = xl_sig
+        if "_xl_bytes" in st.session_state:
+            st.sidebar.download_button(
+                "Download Strategy Report",
+                data=st.session_state._xl_bytes,
+                file_name=f"strategy_{proj_year}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+            )
     except Exception:
         pass
 
@@ -616,14 +420,14 @@ if _page_key == "dashboard":
     render_dashboard(
         df, profiles, yearly_kpis,
         sel_brands, res_level, time_col,
-        base_cr, base_aov,
+        base_cr, base_aov, proj_key,
     )
 elif _page_key == "lab":
     render_lab(
         df, df_raw, sel_brands, res_level, time_col,
         base_sessions, base_cr, base_aov,
         adj_s, adj_conv, adj_rev,
-        t_start, t_end, pure_dna,
+        t_start, t_end, pure_dna, proj_key,
         settings=_settings,
     )
 elif _page_key == "settings":
@@ -4,6 +4,7 @@ BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR   = os.path.join(BASE_DIR, "data")
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 LOGO_PATH  = os.path.join(ASSETS_DIR, "logo.png")
+CSS_PATH   = os.path.join(ASSETS_DIR, "app.css")
 
 PROFILES_PATH   = os.path.join(DATA_DIR, "brand_profiles.csv")
 YEARLY_KPI_PATH = os.path.join(DATA_DIR, "yearly_kpis.csv")
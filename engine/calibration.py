@@ -1,5 +1,9 @@
 """Calibration: anchor base constants to observed trial data, build projections."""
-from engine.simulation import get_shock_multiplier, _build_reapplied_cols
+import numpy as np
+
+from engine.simulation import _shock_vector, _build_reapplied_cols, _layer, _simulate
+
+_MARGIN_FACTORS = np.array([0.85, 1.15])   # ±15% confidence band (Min, Max)
 
 
 def calibrate_base(df, t_start, t_end, adj_sessions, adj_conversions, adj_revenue):
@@ -12,19 +16,24 @@ def calibrate_base(df, t_start, t_end, adj_sessions, adj_conversions, adj_revenu
 
     Returns (base_sessions, base_cr, base_aov) or (None, None, None) on failure.
     """
-    t_mask = (df["Date"].dt.date >= t_start) & (df["Date"].dt.date <= t_end)
-    t_d    = df[t_mask]
+    # datetime64 comparisons on the raw array — no per-row datetime.date objects.
+    dates  = df["Date"].to_numpy()
+    t_mask = ((dates >= np.datetime64(t_start)) &
+              (dates <  np.datetime64(t_end) + np.timedelta64(1, "D")))
+    if not t_mask.any():
+        return None, None, None
 
-    if t_d.empty or t_d["idx_sessions_pretrial"].sum() == 0:
+    sess_sum = df["idx_sessions_pretrial"].to_numpy()[t_mask].sum()
+    if sess_sum == 0:
         return None, None, None
+    cr_mean  = df["idx_cr_pretrial"].to_numpy()[t_mask].mean()
+    aov_mean = df["idx_aov_pretrial"].to_numpy()[t_mask].mean()
 
-    base_sessions = adj_sessions / t_d["idx_sessions_pretrial"].sum()
+    base_sessions = adj_sessions / sess_sum
     trial_cr      = adj_conversions / adj_sessions    if adj_sessions    > 0 else 0
     trial_aov     = adj_revenue     / adj_conversions if adj_conversions > 0 else 0
-    base_cr  = (trial_cr  / t_d["idx_cr_pretrial"].mean()
-                if t_d["idx_cr_pretrial"].mean()  > 0 else trial_cr)
-    base_aov = (trial_aov / t_d["idx_aov_pretrial"].mean()
-                if t_d["idx_aov_pretrial"].mean() > 0 else trial_aov)
+    base_cr  = trial_cr  / cr_mean  if cr_mean  > 0 else trial_cr
+    base_aov = trial_aov / aov_mean if aov_mean > 0 else trial_aov
 
     return base_sessions, base_cr, base_aov
 
@@ -37,29 +46,19 @@ def build_projections(df, base_sessions, base_cr, base_aov, event_log):
         Sessions_Sim,  Conversions_Sim,  Revenue_Sim    — simulation (work DNA + shocks)
         *_Base_Min, *_Base_Max, *_Sim_Min, *_Sim_Max    — ±15% confidence margins
     """
-    # ── Baseline (pre-trial DNA, no shocks) ────────────────────────────────────
-    df["Sessions_Base"]     = base_sessions * df["idx_sessions_pretrial"]
-    df["Conversions_Base"]  = df["Sessions_Base"] * (base_cr  * df["idx_cr_pretrial"])
-    df["Revenue_Base"]      = df["Conversions_Base"] * (base_aov * df["idx_aov_pretrial"])
-
-    # ── Shock multiplier across the full year ──────────────────────────────────
-    df["Shock"] = df["Date"].apply(lambda x: get_shock_multiplier(x, event_log))
-
-    # ── Re-injected signature columns ──────────────────────────────────────────
-    abs_s, abs_c, abs_r, rel_s, rel_c, rel_r = _build_reapplied_cols(df, event_log)
-
-    # ── Simulation (work DNA + shocks + injections) ────────────────────────────
-    s_standard = (base_sessions * df["idx_sessions_work"]) * (1 + df["Shock"])
-    c_standard = s_standard * (base_cr  * df["idx_cr_work"])
-    r_standard = c_standard * (base_aov * df["idx_aov_work"])
-
-    df["Sessions_Sim"]    = s_standard + df["Sessions_Base"]    * rel_s + abs_s
-    df["Conversions_Sim"] = c_standard + df["Conversions_Base"] * rel_c + abs_c
-    df["Revenue_Sim"]     = r_standard + df["Revenue_Base"]     * rel_r + abs_r
+    # All arithmetic runs on raw ndarrays; the new columns are written back in one block.
+    shock = _shock_vector(df["Date"], event_log)
+    s_base, c_base, r_base, s_sim, c_sim, r_sim = _simulate(
+        base_sessions, base_cr, base_aov, _layer(df, "pretrial"), _layer(df, "work"),
+        shock, _build_reapplied_cols(df, event_log))
 
     # ── Confidence margins ±15% ────────────────────────────────────────────────
-    for m in ["Sessions", "Conversions", "Revenue"]:
-        df[f"{m}_Base_Min"] = df[f"{m}_Base"] * 0.85
-        df[f"{m}_Base_Max"] = df[f"{m}_Base"] * 1.15
-        df[f"{m}_Sim_Min"]  = df[f"{m}_Sim"]  * 0.85
-        df[f"{m}_Sim_Max"]  = df[f"{m}_Sim"]  * 1.15
+    # One broadcast over the (N, 6) Base/Sim block → (N, 6, 2) Min/Max.
+    src     = [f"{m}_{v}" for m in ["Sessions", "Conversions", "Revenue"] for v in ["Base", "Sim"]]
+    block   = np.column_stack([s_base, s_sim, c_base, c_sim, r_base, r_sim])
+    margins = (block[:, :, None] * _MARGIN_FACTORS).reshape(len(df), -1)
+
+    cols = ["Sessions_Base", "Conversions_Base", "Revenue_Base", "Shock",
+            "Sessions_Sim",  "Conversions_Sim",  "Revenue_Sim"]
+    cols += [f"{c}_{b}" for c in src for b in ["Min", "Max"]]
+    df[cols] = np.column_stack([s_base, c_base, r_base, shock, s_sim, c_sim, r_sim, margins])
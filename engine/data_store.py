@@ -0,0 +1,62 @@
+"""Data loading: source CSVs with a pre-parsed Parquet cache written alongside."""
+import os
+import pandas as pd
+
+from config import PROFILES_PATH, YEARLY_KPI_PATH, DATASET_PATH
+
+
+def _parquet_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def read_cached(csv_path: str, prepare=None) -> pd.DataFrame:
+    """Read csv_path, preferring a Parquet sibling that is at least as new as the CSV.
+
+    On a miss the CSV is parsed, normalised with `prepare(df)` and written back as
+    Parquet, so later cold starts skip tokenising, type inference and normalisation.
+    If the Parquet engine is missing or the data dir is read-only, the CSV is used.
+    """
+    pq_path = _parquet_path(csv_path)
+    try:
+        # Stale if older than the CSV or than this module (i.e. the prepare steps).
+        if os.path.getmtime(pq_path) >= max(os.path.getmtime(csv_path),
+                                            os.path.getmtime(__file__)):
+            return pd.read_parquet(pq_path)
+    except (OSError, ImportError, ValueError):
+        pass
+
+    df = pd.read_csv(csv_path)
+    if prepare is not None:
+        df = prepare(df)
+    try:
+        df.to_parquet(pq_path, compression="zstd")
+    except (OSError, ImportError, ValueError):
+        pass
+    return df
+
+
+# Low-cardinality keys are stored as categoricals: filters and groupbys compare int
+# codes instead of Python strings. Group on them with observed=True.
+def _prep_profiles(df):
+    df["Year"]  = df["Year"].astype(str).astype("category")
+    df["brand"] = df["brand"].astype("category")
+    df["Level"] = df["Level"].astype("category")
+    return df
+
+
+def _prep_transactions(df):
+    df["Date"]  = pd.to_datetime(df["Date"])
+    df["brand"] = df["brand"].str.strip().str.lower().astype("category")
+    return df
+
+
+def load_profiles() -> pd.DataFrame:
+    return read_cached(PROFILES_PATH, _prep_profiles)
+
+
+def load_yearly_kpis() -> pd.DataFrame:
+    return read_cached(YEARLY_KPI_PATH)
+
+
+def load_transactions() -> pd.DataFrame:
+    return read_cached(DATASET_PATH, _prep_transactions)
@@ -1,50 +1,115 @@
 """DNA computation: demand-normalization indexing and blending."""
+import warnings
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 
 
+@lru_cache(maxsize=256)
 def _periods_from_range(start_d, end_d, t_col):
-    """Return sorted unique period indices covered by [start_d, end_d]."""
+    """Return sorted unique period indices covered by [start_d, end_d] as a tuple.
+
+    Memoised: swap events are re-applied with the same windows on every rerun and
+    for every Attribution Engine subset.
+    """
     dates = pd.date_range(start=start_d, end=end_d)
     if t_col == "Month":
-        return sorted(dates.month.unique().tolist())
+        return tuple(sorted(dates.month.unique().tolist()))
     elif t_col == "Week":
-        return sorted(set(int(w) for w in dates.isocalendar().week))
+        return tuple(sorted(set(int(w) for w in dates.isocalendar().week)))
     else:  # DayOfYear
-        return sorted(dates.dayofyear.unique().tolist())
+        return tuple(sorted(dates.dayofyear.unique().tolist()))
+
+
+@lru_cache(maxsize=64)
+def _trial_days(t_start, t_end):
+    """Day-of-year values of the trial window (memoised, read-only)."""
+    days = pd.date_range(t_start, t_end).dayofyear.to_numpy()
+    days.flags.writeable = False
+    return days
+
+
+def _swap_means(layer, ma, mb):
+    """Swap the per-metric mean levels of the ma and mb periods of a (3, N) layer.
+
+    The masks are turned into index arrays once and the blocks gathered from them,
+    with no per-metric loop.
+    """
+    ia, ib = np.flatnonzero(ma), np.flatnonzero(mb)
+    a, b   = layer[:, ia], layer[:, ib]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        av = a.mean(axis=1)[:, None]
+        bv = b.mean(axis=1)[:, None]
+        layer[:, ia] = np.where(av > 0, a * (bv / av), bv)
+        b = layer[:, ib]   # re-read: A and B may share rows
+        layer[:, ib] = np.where(bv > 0, b * (av / bv), av)
+
 
+def _apply_dna_ev(layer, periods, ev):
+    """Apply a custom_drag or swap event to a (3, N) sessions/cr/aov layer (in-place).
 
-def _apply_dna_ev(df, ev, suffix):
-    """Apply a custom_drag or swap event to idx_*_{suffix} columns in df (in-place)."""
+    periods maps "Month" / "Week" / "DayOfYear" to the N period values of each row.
+    """
     lv    = ev.get("level", "Monthly")
     t_col = "Month" if lv == "Monthly" else "Week" if lv == "Weekly" else "DayOfYear"
-    cols  = [f"idx_sessions_{suffix}", f"idx_cr_{suffix}", f"idx_aov_{suffix}"]
+    t_vals = periods[t_col]
 
     if ev["type"] == "custom_drag":
-        mask = df[t_col] == ev["target"]
-        for c in cols:
-            df.loc[mask, c] *= ev["lift"]
+        layer[:, t_vals == ev["target"]] *= ev["lift"]
 
     elif ev["type"] == "swap":
         if "a_start" in ev:
             a_periods = _periods_from_range(ev["a_start"], ev["a_end"], t_col)
             b_periods = _periods_from_range(ev["b_start"], ev["b_end"], t_col)
             for pa, pb in zip(a_periods, b_periods):
-                ma, mb = df[t_col] == pa, df[t_col] == pb
-                for c in cols:
-                    av = df.loc[ma, c].mean()
-                    bv = df.loc[mb, c].mean()
-                    df.loc[ma, c] = df.loc[ma, c] * (bv / av) if av > 0 else bv
-                    df.loc[mb, c] = df.loc[mb, c] * (av / bv) if bv > 0 else av
+                _swap_means(layer, t_vals == pa, t_vals == pb)
         else:
-            ma, mb = df[t_col] == ev["a"], df[t_col] == ev["b"]
-            for c in cols:
-                av, bv = df.loc[ma, c].mean(), df.loc[mb, c].mean()
-                df.loc[ma, c] = df.loc[ma, c] * (bv / av) if av > 0 else bv
-                df.loc[mb, c] = df.loc[mb, c] * (av / bv) if bv > 0 else av
+            _swap_means(layer, t_vals == ev["a"], t_vals == ev["b"])
+
 
+# Column layout of every ndarray in the profile store (one row per TimeIdx).
+_STORE_COLS = ["TimeIdx", "sessions", "conversions", "revenue",
+               "idx_sessions", "idx_cr", "idx_aov"]
+
+
+def build_profile_store(profiles):
+    """Split brand_profiles once at load time into {(level, brand): {year: ndarray}}.
+
+    Each ndarray holds the rows of one (level, brand, year) group sorted by TimeIdx,
+    with columns _STORE_COLS, so per-rerun brand/level/year selection is a dict
+    lookup instead of boolean-mask filtering over the whole profiles frame.
+    """
+    store = {}
+    for (level, brand, year), grp in profiles.groupby(
+            ["Level", "brand", "Year"], observed=True, sort=True):
+        store.setdefault((level, brand), {})[year] = (
+            grp.sort_values("TimeIdx")[_STORE_COLS].to_numpy(dtype=float))
+    return store
 
-def compute_similarity_weights(profiles, sel_brands, proj_year, t_start, t_end,
+
+def _median_by_time(arrays, times=None):
+    """Median idx_* per TimeIdx across profile-store arrays.
+
+    Rows are scattered into a NaN-padded (n_arrays, T, 3) cube so the median is a
+    single np.nanmedian over axis 0. Returns (times, (T, 3) medians), or None if no
+    arrays; with `times` given, periods absent from every array come back as NaN.
+    """
+    if not arrays:
+        return None
+    if times is None:
+        times = np.unique(np.concatenate([a[:, 0] for a in arrays]))
+    cube = np.full((len(arrays), len(times), 3), np.nan)
+    for i, a in enumerate(arrays):
+        pos = np.searchsorted(times, a[:, 0]).clip(max=len(times) - 1)
+        hit = times[pos] == a[:, 0]
+        cube[i, pos[hit]] = a[hit, 4:7]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)   # all-NaN periods → NaN
+        return times, np.nanmedian(cube, axis=0)
+
+
+def compute_similarity_weights(store, sel_brands, proj_year, t_start, t_end,
                                 c_val, q_val, s_val):
     """Compute dynamic 35/65 similarity weights for historical years.
 
@@ -55,74 +120,77 @@ def compute_similarity_weights(profiles, sel_brands, proj_year, t_start, t_end,
         w_i    = 1 / (err_i + 0.01)        (inverse-error weight)
         norm_w = w_i / Σw_i                 (normalised to sum 1)
     """
-    trial_days  = pd.date_range(t_start, t_end).dayofyear.tolist()
-    daily_dna   = profiles[(profiles["brand"].isin(sel_brands)) & (profiles["Level"] == "Daily")]
-    hist_trial  = daily_dna[daily_dna["TimeIdx"].isin(trial_days)]
-    valid_hist  = hist_trial[
-        (hist_trial["Year"] != "Overall") & (hist_trial["Year"] != str(proj_year))
-    ]
-    yrly_totals = (
-        valid_hist.groupby("Year")
-        .agg({"sessions": "sum", "conversions": "sum", "revenue": "sum"})
-        .reset_index()
-    )
+    trial_days = _trial_days(t_start, t_end)
+    skip_years = ("Overall", str(proj_year))
+
+    yrly_totals = {}   # year → [sessions, conversions, revenue] over the trial days
+    for b in sel_brands:
+        for y, arr in store.get(("Daily", b), {}).items():
+            if y in skip_years:
+                continue
+            rows = arr[np.isin(arr[:, 0], trial_days)]
+            if len(rows):
+                yrly_totals[y] = yrly_totals.get(y, 0) + rows[:, 1:4].sum(axis=0)
 
     weights = {}
-    for _, row in yrly_totals.iterrows():
-        y     = row["Year"]
-        err_c = abs(c_val - row["sessions"])     / max(c_val, 1)
-        err_q = abs(q_val - row["conversions"])  / max(q_val, 1)
-        err_s = abs(s_val - row["revenue"])      / max(s_val, 1)
+    for y in sorted(yrly_totals):
+        sessions, conversions, revenue = yrly_totals[y]
+        err_c = abs(c_val - sessions)     / max(c_val, 1)
+        err_q = abs(q_val - conversions)  / max(q_val, 1)
+        err_s = abs(s_val - revenue)      / max(s_val, 1)
         weights[y] = 1.0 / ((err_c + err_q + err_s) / 3.0 + 0.01)
 
     total = sum(weights.values())
     return {k: v / total for k, v in weights.items()} if total > 0 else {}
 
 
-def build_pure_dna(profiles, sel_brands, norm_weights):
+def build_pure_dna(store, sel_brands, norm_weights):
     """Build the blended monthly DNA profile (35% overall + 65% historical).
 
     Pure DNA_t = 0.35 × Overall_median_t + 0.65 × Σᵢ (wᵢ × Year_i_median_t)
+
+    The yearly medians are stacked into a (n_years, T, 3) array aligned on the
+    overall TimeIdx (missing periods → 1.0, missing years → overall), so the blend
+    is one weighted sum over the year axis.
     """
-    m_dna      = profiles[(profiles["brand"].isin(sel_brands)) & (profiles["Level"] == "Monthly")]
-    m_overall  = (
-        m_dna[m_dna["Year"] == "Overall"]
-        .groupby("TimeIdx")
-        .agg({"idx_sessions": "median", "idx_cr": "median", "idx_aov": "median"})
-        .reset_index()
-    )
-    m_yrly_agg = (
-        m_dna[m_dna["Year"] != "Overall"]
-        .groupby(["Year", "TimeIdx"])
-        .agg({"idx_sessions": "median", "idx_cr": "median", "idx_aov": "median"})
-        .reset_index()
-    )
-
-    pure_dna = m_overall.copy()
-    for col in ["idx_sessions", "idx_cr", "idx_aov"]:
-        pure_dna[col] = m_overall[col] * 0.35
-        for y, w in norm_weights.items():
-            y_data = m_yrly_agg[m_yrly_agg["Year"] == str(y)]
-            if not y_data.empty:
-                merged = (
-                    pure_dna[["TimeIdx"]]
-                    .merge(y_data[["TimeIdx", col]], on="TimeIdx", how="left")
-                    .fillna(1.0)
-                )
-                pure_dna[col] += merged[col] * (0.65 * w)
-            else:
-                pure_dna[col] += m_overall[col] * (0.65 * w)
-
-    return pure_dna
+    monthly           = [store.get(("Monthly", b), {}) for b in sel_brands]
+    times, m_overall  = _median_by_time([m["Overall"] for m in monthly if "Overall" in m])
+
+    years  = list(norm_weights)
+    m_yrly = np.empty((len(years), len(times), 3))
+    for k, y_key in enumerate(map(str, years)):   # store is keyed by year string
+        med = _median_by_time([m[y_key] for m in monthly if y_key in m], times)
+        m_yrly[k] = m_overall if med is None else np.where(np.isnan(med[1]), 1.0, med[1])
+
+    w    = np.array([norm_weights[y] for y in years], dtype=float)
+    pure = m_overall * 0.35 + np.tensordot(w * 0.65, m_yrly, axes=1)
+
+    return pd.DataFrame({
+        "TimeIdx":      times.astype(int),
+        "idx_sessions": pure[:, 0],
+        "idx_cr":       pure[:, 1],
+        "idx_aov":      pure[:, 2],
+    })
+
+
+@lru_cache(maxsize=8)
+def _year_layout(proj_year):
+    """Dates and Month / ISO Week / DayOfYear arrays of one year (memoised, read-only)."""
+    full_year = pd.date_range(start=f"{proj_year}-01-01", end=f"{proj_year}-12-31")
+    periods = {
+        "Month":     full_year.month.to_numpy(),
+        "Week":      full_year.isocalendar().week.to_numpy().astype(int),
+        "DayOfYear": full_year.dayofyear.to_numpy(),
+    }
+    for arr in periods.values():
+        arr.flags.writeable = False
+    return full_year, periods
 
 
 def build_year_dataframe(proj_year):
     """Build the 365-day base DataFrame for the projection year."""
-    full_year = pd.date_range(start=f"{proj_year}-01-01", end=f"{proj_year}-12-31")
-    df = pd.DataFrame({"Date": full_year})
-    df["Month"]     = df["Date"].dt.month
-    df["Week"]      = df["Date"].dt.isocalendar().week.astype(int)
-    df["DayOfYear"] = df["Date"].dt.dayofyear
+    full_year, periods = _year_layout(int(proj_year))
+    df = pd.DataFrame({"Date": full_year, **periods})
     return df, full_year
 
 
@@ -133,28 +201,30 @@ def build_dna_layers(df, pure_dna, event_log):
         pure     — raw blended DNA (no modifications)
         pretrial — pure + pre_trial events → used for base calibration
         work     — pretrial + post_trial events → used for simulation (After)
+
+    Events are applied to (3, N) sessions/cr/aov arrays and the 9 columns written
+    back in one block. Returns {"pure", "pretrial", "work"} → (3, N) ndarray.
     """
-    merged = (
-        df[["Month"]]
-        .merge(
-            pure_dna[["TimeIdx", "idx_sessions", "idx_cr", "idx_aov"]],
-            left_on="Month", right_on="TimeIdx", how="left",
-        )
-        .fillna(1.0)
-    )
-
-    for m in ["sessions", "cr", "aov"]:
-        df[f"idx_{m}_pure"]     = merged[f"idx_{m}"].values
-        df[f"idx_{m}_pretrial"] = merged[f"idx_{m}"].values
-        df[f"idx_{m}_work"]     = merged[f"idx_{m}"].values
+    periods = {c: df[c].to_numpy() for c in ["Month", "Week", "DayOfYear"]}
 
+    # Month → (sessions, cr, aov) lookup table; months missing from pure_dna stay 1.0.
+    t_idx  = pure_dna["TimeIdx"].to_numpy(dtype=int)
+    lookup = np.ones((max(13, t_idx.max(initial=0) + 1), 3))
+    vals   = pure_dna[["idx_sessions", "idx_cr", "idx_aov"]].to_numpy(dtype=float)
+    lookup[t_idx] = np.where(np.isnan(vals), 1.0, vals)
+
+    idx_pure = lookup[periods["Month"]].T.copy()
+    idx_pre  = idx_pure.copy()
     for ev in event_log:
         if ev["type"] in ["custom_drag", "swap"] and ev.get("scope") == "pre_trial":
-            _apply_dna_ev(df, ev, "pretrial")
-
-    for m in ["sessions", "cr", "aov"]:
-        df[f"idx_{m}_work"] = df[f"idx_{m}_pretrial"].copy()
+            _apply_dna_ev(idx_pre, periods, ev)
 
+    idx_work = idx_pre.copy()
     for ev in event_log:
         if ev["type"] in ["custom_drag", "swap"] and ev.get("scope", "post_trial") == "post_trial":
-            _apply_dna_ev(df, ev, "work")
+            _apply_dna_ev(idx_work, periods, ev)
+
+    layers = {"pure": idx_pure, "pretrial": idx_pre, "work": idx_work}
+    cols   = [f"idx_{m}_{l}" for m in ["sessions", "cr", "aov"] for l in layers]
+    df[cols] = np.stack(list(layers.values()), axis=1).reshape(len(cols), -1).T
+    return layers
@@ -1,4 +1,5 @@
 """App settings: per-entity campaign defaults."""
+import copy
 import json
 import os
 
@@ -10,7 +11,12 @@ _SHAPES = ["Email Campaign", "Flash Sale", "Product Launch", "Awareness Drive"]
 _DEFAULT_CAMPAIGN_DEFAULTS = {shape: 25 for shape in _SHAPES}
 
 
-def load_settings() -> dict:
+# Parsed settings keyed on the file's mtime (None = no file yet); reparsed only
+# when settings.json changes on disk.
+_SETTINGS_CACHE = {"mtime": None, "data": None}
+
+
+def _read_settings() -> dict:
     if not os.path.exists(_SETTINGS_PATH):
         return {"campaign_defaults": {"__all__": dict(_DEFAULT_CAMPAIGN_DEFAULTS)}}
     with open(_SETTINGS_PATH) as f:
@@ -22,10 +28,23 @@ def load_settings() -> dict:
     return data
 
 
+def load_settings() -> dict:
+    """Return a private copy of the settings, re-reading the file only if it changed."""
+    try:
+        mtime = os.path.getmtime(_SETTINGS_PATH)
+    except OSError:
+        mtime = None
+    if _SETTINGS_CACHE["data"] is None or _SETTINGS_CACHE["mtime"] != mtime:
+        _SETTINGS_CACHE["data"]  = _read_settings()
+        _SETTINGS_CACHE["mtime"] = mtime
+    return copy.deepcopy(_SETTINGS_CACHE["data"])
+
+
 def save_settings(settings: dict) -> None:
     os.makedirs(os.path.dirname(_SETTINGS_PATH), exist_ok=True)
     with open(_SETTINGS_PATH, "w") as f:
         json.dump(settings, f, indent=2)
+    _SETTINGS_CACHE["data"] = None
 
 
 def get_campaign_default(settings: dict, brand: str, shape: str) -> int:
@@ -1,7 +1,7 @@
 """Event simulation engine: campaign shapes, shock multipliers, attribution."""
+from functools import lru_cache
+
 import numpy as np
-import pandas as pd
-from datetime import timedelta
 
 from config import EVENT_MAPPING
 
@@ -37,31 +37,144 @@ def get_shock_multiplier(dt, shocks):
     return total
 
 
+# Integer shape tags, resolved once per campaign label instead of per (day, shock).
+_STEP, _LINEAR_FADE, _FRONT_LOADED, _DELAYED_PEAK = range(4)
+_SHAPE_IDS = {"Step": _STEP, "Linear Fade": _LINEAR_FADE,
+              "Front-Loaded": _FRONT_LOADED, "Delayed Peak": _DELAYED_PEAK}
+_SHAPE_TAG = {label: _SHAPE_IDS[shape] for label, shape in EVENT_MAPPING.items()}
+
+
+@lru_cache(maxsize=64)
+def _unit_curve(shape, duration):
+    """Unit-strength per-day curve of one campaign shape over `duration` days
+    (memoised, read-only): only the strength changes as the lift slider moves."""
+    t = np.arange(max(duration, 0))
+    p = t / duration if duration > 0 else t
+    tag = _SHAPE_TAG.get(shape, _STEP)
+    if tag == _LINEAR_FADE:
+        curve = 1 - p
+    elif tag == _FRONT_LOADED:
+        curve = np.exp(-3.0 * p)
+    elif tag == _DELAYED_PEAK:
+        curve = np.exp(-((t - duration * 0.4) ** 2) / (2 * (duration * 0.3) ** 2))
+    else:  # Step
+        curve = np.ones(len(t))
+    curve.flags.writeable = False
+    return curve
+
+
+def shock_kernel(shock):
+    """Per-day multiplier of one shock over its own window (index 0 = start date).
+
+    Same shape functions as get_shock_multiplier. Computed once when the event is
+    logged and stored as shock["kernel"], so reruns only scatter-add it.
+    """
+    duration = (shock["end"] - shock["start"]).days + 1
+    return shock["str"] * _unit_curve(shock["shape"], duration)
+
+
+def _shock_vector(dates, shocks):
+    """Vectorized get_shock_multiplier: total shock multiplier for every date in `dates`.
+
+    Loops once per shock event (not per day) and scatter-adds its kernel — the
+    pre-built shock["kernel"] when present and still matching the window — into a
+    preallocated array aligned with `dates`.
+    """
+    days  = np.asarray(dates, dtype="datetime64[D]")
+    total = np.zeros(len(days))
+    if not len(days):
+        return total
+    lo, hi = days.min().item(), days.max().item()   # datetime.date bounds
+
+    for s in shocks:
+        # Cull shocks outside the date span before building any mask.
+        if s["type"] != "shock" or s["end"] < lo or s["start"] > hi:
+            continue
+        start = np.datetime64(s["start"], "D")
+        end   = np.datetime64(s["end"], "D")
+        mask  = (days >= start) & (days <= end)
+        kernel = s.get("kernel")
+        if kernel is None or len(kernel) != (s["end"] - s["start"]).days + 1:
+            kernel = shock_kernel(s)
+        total[mask] += np.asarray(kernel)[(days[mask] - start).astype(np.int64)]
+    return total
+
+
+def _day_keys(dates):
+    """Dates as int64 day numbers (days since 1970-01-01) for cheap integer masks."""
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+def _day_key(d):
+    """Scalar date → int64 day number, comparable with _day_keys()."""
+    return np.datetime64(d, "D").astype(np.int64)
+
+
+def injection_block(ev):
+    """(3, duration) sessions/conv/rev daily additions of a reapplied_shock event.
+
+    Absolute deltas for "Absolute Volume" mode, baseline fractions otherwise. Built
+    once when the signature is injected and stored as ev["daily"], so reruns and
+    attribution subsets reuse the array instead of re-converting the lists.
+    """
+    pre = "daily_abs_" if ev["mode"] == "Absolute Volume" else "daily_pct_"
+    return np.array([ev[pre + m] for m in "scr"], dtype=float)
+
+
 def _build_reapplied_cols(df, ev_subset):
     """Compute absolute and relative addition arrays from reapplied_shock events."""
-    n = len(df)
-    abs_s = np.zeros(n); abs_c = np.zeros(n); abs_r = np.zeros(n)
-    rel_s = np.zeros(n); rel_c = np.zeros(n); rel_r = np.zeros(n)
+    days = _day_keys(df["Date"])
+    abs_ = np.zeros((3, len(df)))   # sessions, conversions, revenue rows
+    rel_ = np.zeros((3, len(df)))
 
     for ev in ev_subset:
         if ev["type"] != "reapplied_shock":
             continue
-        new_end = ev["new_start"] + timedelta(days=ev["duration"] - 1)
-        mask = (df["Date"].dt.date >= ev["new_start"]) & (df["Date"].dt.date <= new_end)
-        idx  = df[mask].index
-        k    = min(len(idx), ev["duration"])
-        if ev["mode"] == "Absolute Volume":
-            abs_s[idx[:k]] += np.array(ev["daily_abs_s"][:k])
-            abs_c[idx[:k]] += np.array(ev["daily_abs_c"][:k])
-            abs_r[idx[:k]] += np.array(ev["daily_abs_r"][:k])
-        else:
-            rel_s[idx[:k]] += np.array(ev["daily_pct_s"][:k])
-            rel_c[idx[:k]] += np.array(ev["daily_pct_c"][:k])
-            rel_r[idx[:k]] += np.array(ev["daily_pct_r"][:k])
-
+        start = _day_key(ev["new_start"])
+        idx   = np.flatnonzero((days >= start) & (days <= start + ev["duration"] - 1))
+        k     = min(len(idx), ev["duration"])
+        block = ev.get("daily")
+        if block is None:
+            block = injection_block(ev)
+        target = abs_ if ev["mode"] == "Absolute Volume" else rel_
+        target[:, idx[:k]] += block[:, :k]
+
+    abs_s, abs_c, abs_r = abs_
+    rel_s, rel_c, rel_r = rel_
     return abs_s, abs_c, abs_r, rel_s, rel_c, rel_r
 
 
+def _layer(df, suffix):
+    """(sessions, cr, aov) index arrays of one DNA layer as raw ndarrays."""
+    return tuple(df[f"idx_{m}_{suffix}"].to_numpy() for m in ("sessions", "cr", "aov"))
+
+
+def _simulate(b_sess, b_cr, b_aov, idx_pre, idx_work, shock, reapplied):
+    """Baseline + simulation arithmetic on raw ndarrays, shared by projections and attribution.
+
+    idx_pre / idx_work are (3, N) sessions/cr/aov layers (or _layer() tuples), reapplied is the _build_reapplied_cols()
+    output. Returns (s_base, c_base, r_base, s_sim, c_sim, r_sim).
+    """
+    idx_s_pre, idx_cr_pre, idx_aov_pre = idx_pre
+    idx_s_w,   idx_cr_w,   idx_aov_w   = idx_work
+    abs_s, abs_c, abs_r, rel_s, rel_c, rel_r = reapplied
+
+    # ── Baseline (pre-trial DNA, no shocks) ────────────────────────────────────
+    s_base = b_sess * idx_s_pre
+    c_base = s_base * (b_cr  * idx_cr_pre)
+    r_base = c_base * (b_aov * idx_aov_pre)
+
+    # ── Simulation (work DNA + shocks + injections) ────────────────────────────
+    s_std = (b_sess * idx_s_w) * (1 + shock)
+    c_std = s_std * (b_cr  * idx_cr_w)
+    r_std = c_std * (b_aov * idx_aov_w)
+
+    return (s_base, c_base, r_base,
+            s_std + s_base * rel_s + abs_s,
+            c_std + c_base * rel_c + abs_c,
+            r_std + r_base * rel_r + abs_r)
+
+
 def eval_events(ev_subset, *, pure_dna, adj_sessions, adj_conversions, adj_revenue,
                 t_start, t_end, tgt_start, tgt_end):
     """Full simulation rebuild for an event subset (used by Attribution Engine).
@@ -71,38 +184,40 @@ def eval_events(ev_subset, *, pure_dna, adj_sessions, adj_conversions, adj_reven
     from engine.dna import build_year_dataframe, build_dna_layers
 
     df, _ = build_year_dataframe(t_start.year)
-    build_dna_layers(df, pure_dna, ev_subset)
+    layers = build_dna_layers(df, pure_dna, ev_subset)
 
-    t_mask = (df["Date"].dt.date >= t_start) & (df["Date"].dt.date <= t_end)
-    t_d    = df[t_mask]
+    days   = _day_keys(df["Date"])
+    t_mask = (days >= _day_key(t_start)) & (days <= _day_key(t_end))
+    pre_t  = layers["pretrial"][:, t_mask]   # (3, trial days) sessions/cr/aov
 
-    if t_d.empty or t_d["idx_sessions_pretrial"].sum() == 0:
+    if not t_mask.any() or pre_t[0].sum() == 0:
         return {"Revenue": 0.0, "Conversions": 0.0, "Sessions": 0.0}
 
-    b_sess = adj_sessions / t_d["idx_sessions_pretrial"].sum()
+    cr_mean, aov_mean = pre_t[1].mean(), pre_t[2].mean()
+    b_sess = adj_sessions / pre_t[0].sum()
     t_cr   = adj_conversions / adj_sessions   if adj_sessions   > 0 else 0
     t_aov  = adj_revenue     / adj_conversions if adj_conversions > 0 else 0
-    b_cr   = t_cr  / t_d["idx_cr_pretrial"].mean()  if t_d["idx_cr_pretrial"].mean()  > 0 else t_cr
-    b_aov  = t_aov / t_d["idx_aov_pretrial"].mean() if t_d["idx_aov_pretrial"].mean() > 0 else t_aov
-
-    df["Sessions_Base_"] = b_sess * df["idx_sessions_pretrial"]
-    df["Conv_Base_"]     = df["Sessions_Base_"] * (b_cr  * df["idx_cr_pretrial"])
-    df["Rev_Base_"]      = df["Conv_Base_"]      * (b_aov * df["idx_aov_pretrial"])
-
-    df["Shock_"] = df["Date"].apply(lambda x: get_shock_multiplier(x, ev_subset))
-    as_, ac, ar, rs, rc, rr = _build_reapplied_cols(df, ev_subset)
-
-    s_std = (b_sess * df["idx_sessions_work"]) * (1 + df["Shock_"])
-    c_std = s_std * (b_cr  * df["idx_cr_work"])
-    r_std = c_std * (b_aov * df["idx_aov_work"])
+    b_cr   = t_cr  / cr_mean  if cr_mean  > 0 else t_cr
+    b_aov  = t_aov / aov_mean if aov_mean > 0 else t_aov
 
-    s_sim = s_std + df["Sessions_Base_"] * rs + as_
-    c_sim = c_std + df["Conv_Base_"]     * rc + ac
-    r_sim = r_std + df["Rev_Base_"]      * rr + ar
+    # Only the target-period totals are needed: nothing is written back to df.
+    *_, s_sim, c_sim, r_sim = _simulate(
+        b_sess, b_cr, b_aov, layers["pretrial"], layers["work"],
+        _shock_vector(df["Date"], ev_subset), _build_reapplied_cols(df, ev_subset))
 
-    tgt = (df["Date"].dt.date >= tgt_start) & (df["Date"].dt.date <= tgt_end)
+    tgt = (days >= _day_key(tgt_start)) & (days <= _day_key(tgt_end))
     return {
         "Revenue":     float(r_sim[tgt].sum()),
         "Conversions": float(c_sim[tgt].sum()),
         "Sessions":    float(s_sim[tgt].sum()),
     }
+
+
+def eval_prefixes(event_log, evaluate=eval_events, **kwargs):
+    """eval_events for every prefix event_log[:0] … event_log[:N] (N + 1 rebuilds).
+
+    Attribution compares consecutive prefixes, so each prefix is evaluated once and
+    shared by the events on either side of it. kwargs are passed to `evaluate`, which
+    callers can swap for a memoised eval_events.
+    """
+    return [evaluate(event_log[:i], **kwargs) for i in range(len(event_log) + 1)]
@@ -15,7 +15,7 @@ import os
 import numpy as np
 import pandas as pd
 
-np.random.seed(42)
+rng = np.random.default_rng(42)
 
 # ── Entity definitions ──────────────────────────────────────────────────────────
 # Five synthetic entities with distinct business patterns.
@@ -73,51 +73,70 @@ END_DATE   = "2025-10-31"
 # ── Transaction generation ───────────────────────────────────────────────────────
 
 def build_transactions() -> pd.DataFrame:
-    dates = pd.date_range(START_DATE, END_DATE, freq="D")
-    rows  = []
-
-    for d in dates:
-        month_idx = d.month - 1
-        dow_idx   = d.dayofweek
-        for brand, cfg in ENTITIES.items():
-            year_factor = (1 + cfg["growth"]) ** (d.year - 2022)
-            seasonal    = cfg["seasonal"][month_idx]
-            dow_f       = DOW_FACTORS[dow_idx]
-
-            # Log-normal noise keeps values positive and realistic
-            s_noise  = np.random.lognormal(0, 0.18)
-            cr_noise = np.random.lognormal(0, 0.12)
-            aov_noise= np.random.lognormal(0, 0.09)
-
-            sessions    = max(0.0, cfg["base_sessions"] * year_factor * seasonal * dow_f * s_noise)
-            cr          = min(0.25, max(0.0001, cfg["base_cr"] * cr_noise))
-            aov         = max(5.0,  cfg["base_aov"] * aov_noise)
-            # Poisson sampling handles low-volume entities correctly
-            expected_conv = sessions * cr
-            conversions   = int(np.random.poisson(expected_conv)) if expected_conv > 0 else 0
-            revenue       = round(conversions * aov, 2)
+    dates  = pd.date_range(START_DATE, END_DATE, freq="D")
+    n      = len(dates)
+    months = dates.month.to_numpy() - 1
+    dows   = dates.dayofweek.to_numpy()
+    years  = dates.year.to_numpy() - 2022
+    dow_f  = np.asarray(DOW_FACTORS)[dows]
+    n_ent  = len(ENTITIES)
+
+    # (entity, day) blocks, filled by one vectorized pass per entity.
+    sessions    = np.empty((n_ent, n))
+    conversions = np.empty((n_ent, n), dtype=np.int64)
+    revenue     = np.empty((n_ent, n))
+    cr          = np.empty((n_ent, n))
+    aov         = np.empty((n_ent, n))
+
+    for e, cfg in enumerate(ENTITIES.values()):
+        year_factor = (1 + cfg["growth"]) ** years
+        seasonal    = np.asarray(cfg["seasonal"])[months]
+
+        # Log-normal noise keeps values positive and realistic
+        s_noise   = rng.lognormal(0, 0.18, size=n)
+        cr_noise  = rng.lognormal(0, 0.12, size=n)
+        aov_noise = rng.lognormal(0, 0.09, size=n)
+
+        sessions[e] = np.maximum(0.0, cfg["base_sessions"] * year_factor * seasonal * dow_f * s_noise)
+        cr[e]       = np.clip(cfg["base_cr"] * cr_noise, 0.0001, 0.25)
+        aov[e]      = np.maximum(5.0, cfg["base_aov"] * aov_noise)
+        # Poisson sampling handles low-volume entities correctly
+        conversions[e] = rng.poisson(sessions[e] * cr[e])
+        revenue[e]     = np.round(conversions[e] * aov[e], 2)
+
+    # .T.ravel() gives day-major row order (all entities for a date, then the next
+    # date) directly, so the frame is built once with no concat + sort copies.
+    return pd.DataFrame({
+        "Date":             np.repeat(dates, n_ent),
+        "brand":            np.tile(list(ENTITIES), n),
+        "sessions":         np.round(sessions).astype(int).T.ravel(),
+        "conversions":      conversions.T.ravel(),
+        "revenue":          revenue.T.ravel(),
+        "cr":               np.round(cr, 6).T.ravel(),
+        "aov":              np.round(aov, 2).T.ravel(),
+        "campaign":         "no",
+        "campaign_volume":  "no-campaign",
+    })
 
-            rows.append({
-                "Date":             d.date(),
-                "brand":            brand,
-                "sessions":         round(sessions),
-                "conversions":      conversions,
-                "revenue":          revenue,
-                "cr":               round(cr, 6),
-                "aov":              round(aov, 2),
-                "campaign":         "no",
-                "campaign_volume":  "no-campaign",
-            })
 
-    return pd.DataFrame(rows)
+# ── Profile computation ─────────────────────────────────────────────────────────
 
+def _idx(agg: pd.DataFrame, keys: list, cols: list) -> np.ndarray:
+    """Normalize each column to median = 1 within its `keys` group (1.0 where median is 0).
 
-# ── Profile computation ─────────────────────────────────────────────────────────
+    Group medians come from one transform("median") pass instead of a Python
+    function per group.
+    """
+    vals = agg[cols].to_numpy(dtype=float)
+    med  = agg.groupby(keys)[cols].transform("median").to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(med > 0, vals / med, 1.0)
 
-def _idx(series: pd.Series) -> pd.Series:
-    """Normalize to median = 1. Returns 1.0 if median is zero."""
-    med = series.median()
-    return (series / med).fillna(1.0) if med > 0 else pd.Series(1.0, index=series.index)
+
+_LEVELS = [("Monthly", "Month"), ("Weekly", "Week"), ("Daily", "DayOfYear")]
+_SUMS   = dict(sessions=("sessions", "sum"),
+               conversions=("conversions", "sum"),
+               revenue=("revenue", "sum"))
 
 
 def build_profiles(df: pd.DataFrame) -> pd.DataFrame:
@@ -127,50 +146,40 @@ def build_profiles(df: pd.DataFrame) -> pd.DataFrame:
     df["Month"]     = df["Date"].dt.month
     df["Week"]      = df["Date"].dt.isocalendar().week.astype(int)
     df["DayOfYear"] = df["Date"].dt.dayofyear
+    df = df[df["brand"].isin(list(ENTITIES))]
 
+    # Two groupbys per level (per-year and Overall) over all entities at once.
     parts = []
-
-    for brand in ENTITIES:
-        bdf = df[df["brand"] == brand]
-        years = [("Overall", bdf)] + [
-            (y, bdf[bdf["Year"] == y]) for y in sorted(bdf["Year"].unique())
-        ]
-
-        for year_label, ydf in years:
-            if ydf.empty:
-                continue
-
-            for level, t_col in [("Monthly", "Month"), ("Weekly", "Week"), ("Daily", "DayOfYear")]:
-                agg = (
-                    ydf.groupby(t_col)
-                    .agg(sessions=("sessions", "sum"),
-                         conversions=("conversions", "sum"),
-                         revenue=("revenue", "sum"))
-                    .reset_index()
-                    .rename(columns={t_col: "TimeIdx"})
-                )
-                agg["cr"]  = agg["conversions"] / agg["sessions"].replace(0, float("nan"))
-                agg["aov"] = agg["revenue"]      / agg["conversions"].replace(0, float("nan"))
-                agg = agg.fillna(0)
-
-                agg["idx_sessions"] = _idx(agg["sessions"]).values
-                agg["idx_cr"]       = _idx(agg["cr"]).values
-                agg["idx_aov"]      = _idx(agg["aov"]).values
-
-                agg["brand"]   = brand
-                agg["Level"]   = level
-                agg["Year"]    = year_label
-                agg["level_1"] = agg["TimeIdx"] - 1
-
-                parts.append(agg[[
-                    "brand", "level_1", "TimeIdx",
-                    "sessions", "conversions", "revenue",
-                    "cr", "aov",
-                    "idx_sessions", "idx_cr", "idx_aov",
-                    "Level", "Year",
-                ]])
-
-    return pd.concat(parts, ignore_index=True)
+    for level, t_col in _LEVELS:
+        overall = df.groupby(["brand", t_col]).agg(**_SUMS).reset_index()
+        yearly  = df.groupby(["brand", "Year", t_col]).agg(**_SUMS).reset_index()
+        agg = pd.concat([overall.assign(Year="Overall"), yearly], ignore_index=True)
+        parts.append(agg.rename(columns={t_col: "TimeIdx"}).assign(Level=level))
+    agg = pd.concat(parts, ignore_index=True)
+
+    agg["cr"]  = agg["conversions"] / agg["sessions"].replace(0, float("nan"))
+    agg["aov"] = agg["revenue"]      / agg["conversions"].replace(0, float("nan"))
+    agg = agg.fillna(0)
+
+    agg[["idx_sessions", "idx_cr", "idx_aov"]] = _idx(
+        agg, ["brand", "Year", "Level"], ["sessions", "cr", "aov"])
+    agg["level_1"] = agg["TimeIdx"] - 1
+
+    # Row order: entity → Overall, then years ascending → Monthly/Weekly/Daily → TimeIdx.
+    order = pd.DataFrame({
+        "b": agg["brand"].map({b: i for i, b in enumerate(ENTITIES)}),
+        "y": agg["Year"].where(agg["Year"] != "Overall", ""),
+        "l": agg["Level"].map({lv: i for i, (lv, _) in enumerate(_LEVELS)}),
+        "t": agg["TimeIdx"],
+    }).sort_values(["b", "y", "l", "t"]).index
+
+    return agg.loc[order, [
+        "brand", "level_1", "TimeIdx",
+        "sessions", "conversions", "revenue",
+        "cr", "aov",
+        "idx_sessions", "idx_cr", "idx_aov",
+        "Level", "Year",
+    ]].reset_index(drop=True)
 
 
 # ── Yearly KPIs ─────────────────────────────────────────────────────────────────
@@ -17,6 +17,20 @@ GRAY   = RGBColor(0xAA, 0xAA, 0xAA)
 DARK   = RGBColor(0x11, 0x11, 0x11)
 GREEN  = RGBColor(0x10, 0xB9, 0x81)
 TEAL   = RGBColor(0x06, 0xB6, 0xD4)
+BODY   = RGBColor(0x44, 0x44, 0x44)
+PH_BG  = RGBColor(0xE8, 0xEE, 0xF8)
+NAVY_DEEP = RGBColor(0x0e, 0x0e, 0x55)   # cover right-hand panel
+NAVY_CARD = RGBColor(0x14, 0x14, 0x55)   # "Get Started" step cards
+SILVER    = RGBColor(0xCC, 0xCC, 0xCC)
+LAVENDER  = RGBColor(0x88, 0x88, 0xBB)   # cover screenshot hint
+
+# Lengths reused by the helpers, converted to EMU once.
+BORDER_W = Inches(0.04)
+PH_LINE  = Pt(1.2)
+PH_FONT  = Pt(10)
+CARD_ICON  = (Inches(0.12), Inches(0.08), Inches(0.4))   # left pad, top pad, size
+CARD_TITLE = (Inches(0.55), Inches(0.10), Inches(0.65), Inches(0.35))
+CARD_BODY  = (Inches(0.12), Inches(0.48), Inches(0.22), Inches(0.6))
 
 prs = Presentation()
 prs.slide_width  = Inches(13.33)
@@ -25,6 +39,10 @@ W = prs.slide_width
 H = prs.slide_height
 BLANK = prs.slide_layouts[6]
 
+def _grid(start, step, n):
+    """Inches(start + i*step) for i in range(n) — grid offsets computed once per slide."""
+    return [Inches(start + i*step) for i in range(n)]
+
 def _slide():
     return prs.slides.add_slide(BLANK)
 
@@ -40,29 +58,32 @@ def _txt(slide, text, left, top, width, height,
     tf = tb.text_frame; tf.word_wrap = True
     p = tf.paragraphs[0]; p.alignment = align
     r = p.add_run(); r.text = text
-    r.font.size = Pt(size); r.font.bold = bold
-    r.font.color.rgb = color; r.font.italic = italic
+    f = r.font
+    f.size = Pt(size); f.bold = bold
+    f.color.rgb = color; f.italic = italic
     return tb
 
-def _accent_bar(slide, top, color=ORANGE, height=Inches(0.04)):
+def _accent_bar(slide, top, color=ORANGE, height=BORDER_W):
     _rect(slide, 0, top, W, height, color)
 
 def _ph(slide, left, top, width, height, label):
     box = slide.shapes.add_shape(1, left, top, width, height)
-    box.fill.solid(); box.fill.fore_color.rgb = RGBColor(0xE8, 0xEE, 0xF8)
-    box.line.color.rgb = NAVY; box.line.width = Pt(1.2)
+    box.fill.solid(); box.fill.fore_color.rgb = PH_BG
+    box.line.color.rgb = NAVY; box.line.width = PH_LINE
     tf = box.text_frame; p = tf.paragraphs[0]; p.alignment = PP_ALIGN.CENTER
     r = p.add_run(); r.text = f"📸  {label}"
-    r.font.size = Pt(10); r.font.color.rgb = NAVY; r.font.italic = True
+    f = r.font
+    f.size = PH_FONT; f.color.rgb = NAVY; f.italic = True
 
 def _card(slide, left, top, width, height, icon, title, body,
-          bg=WHITE, title_color=DARK, body_color=RGBColor(0x44,0x44,0x44)):
+          bg=WHITE, title_color=DARK, body_color=BODY):
     _rect(slide, left, top, width, height, bg)
-    border = slide.shapes.add_shape(1, left, top, Inches(0.04), height)
+    border = slide.shapes.add_shape(1, left, top, BORDER_W, height)
     border.fill.solid(); border.fill.fore_color.rgb = ORANGE; border.line.fill.background()
-    _txt(slide, icon, left+Inches(0.12), top+Inches(0.08), Inches(0.4), Inches(0.4), size=18, color=title_color)
-    _txt(slide, title, left+Inches(0.55), top+Inches(0.10), width-Inches(0.65), Inches(0.35), size=11, bold=True, color=title_color)
-    _txt(slide, body, left+Inches(0.12), top+Inches(0.48), width-Inches(0.22), height-Inches(0.6), size=9, color=body_color)
+    (il, it, isz), (tl, tt, tw, th), (bl, bt, bw, bh) = CARD_ICON, CARD_TITLE, CARD_BODY
+    _txt(slide, icon, left+il, top+it, isz, isz, size=18, color=title_color)
+    _txt(slide, title, left+tl, top+tt, width-tw, th, size=11, bold=True, color=title_color)
+    _txt(slide, body, left+bl, top+bt, width-bw, height-bh, size=9, color=body_color)
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SLIDE 1 — COVER
@@ -70,7 +91,7 @@ def _card(slide, left, top, width, height, icon, title, body,
 sl = _slide()
 _rect(sl, 0, 0, W, H, NAVY)
 _rect(sl, 0, H-Inches(0.12), W, Inches(0.12), ORANGE)
-_rect(sl, W*0.55, 0, W*0.45, H, RGBColor(0x0e,0x0e,0x55))
+_rect(sl, W*0.55, 0, W*0.45, H, NAVY_DEEP)
 
 _txt(sl, "PRODUCT OVERVIEW", Inches(0.7), Inches(0.8), Inches(5), Inches(0.4),
      size=9, bold=True, color=ORANGE)
@@ -82,7 +103,7 @@ _txt(sl, (
     "Model campaign scenarios, isolate demand shocks,\n"
     "and project outcomes — all in a browser, no code required."
 ), Inches(0.7), Inches(3.2), Inches(5.5), Inches(1.2),
-    size=12, color=RGBColor(0xCC,0xCC,0xCC))
+    size=12, color=SILVER)
 
 _txt(sl, "🌐  Try it free:  https://campaign-analytics-lab.streamlit.app",
      Inches(0.7), Inches(4.7), Inches(5.5), Inches(0.4), size=10, bold=True, color=ORANGE)
@@ -91,7 +112,7 @@ _txt(sl, "Demo login:  demo  /  demo2026",
 
 _txt(sl, "📸  INSERT: App screenshot (public URL — login or dashboard)",
      Inches(7.2), Inches(1.0), Inches(5.8), Inches(5.2),
-     size=10, color=RGBColor(0x88,0x88,0xBB), italic=True, align=PP_ALIGN.CENTER)
+     size=10, color=LAVENDER, italic=True, align=PP_ALIGN.CENTER)
 
 _txt(sl, f"{datetime.date.today().year}  ·  Open-source demo",
      Inches(0.7), Inches(6.9), Inches(4), Inches(0.4), size=8, color=GRAY)
@@ -123,11 +144,12 @@ caps = [
      "Waterfall breakdown of which events contribute how much to your revenue target — "
      "in absolute volume and percentage of gap."),
 ]
+lefts, tops = _grid(0.5, 6.3, 2), _grid(1.7, 2.55, 2)
 for i, (ic, tt, dd) in enumerate(caps):
     col = i % 2; row = i // 2
     _card(sl,
-          left=Inches(0.5+col*6.3),
-          top=Inches(1.7+row*2.55),
+          left=lefts[col],
+          top=tops[row],
           width=Inches(6.0), height=Inches(2.25),
           icon=ic, title=tt, body=dd)
 
@@ -179,7 +201,7 @@ tabs = [
 for i, (ic, tt, dd) in enumerate(tabs):
     top = Inches(0.85 + i * 1.5)
     _rect(sl, Inches(9.1), top, Inches(4.0), Inches(1.3), WHITE)
-    border = sl.shapes.add_shape(1, Inches(9.1), top, Inches(0.04), Inches(1.3))
+    border = sl.shapes.add_shape(1, Inches(9.1), top, BORDER_W, Inches(1.3))
     border.fill.solid(); border.fill.fore_color.rgb = ORANGE; border.line.fill.background()
     _txt(sl, ic, Inches(9.22), top+Inches(0.1), Inches(0.4), Inches(0.4), size=14, color=DARK)
     _txt(sl, tt, Inches(9.65), top+Inches(0.1), Inches(3.3), Inches(0.35), size=10, bold=True, color=DARK)
@@ -209,11 +231,12 @@ feats = [
     ("📖", "Built-in documentation",   "Full model explanation and formula guide in-app"),
     ("📊", "Goal Tracker",             "Set revenue / orders / clicks targets with growth scenarios"),
 ]
+lefts, tops = _grid(0.45, 4.28, 3), _grid(1.52, 1.95, 3)
 for i, (ic, tt, dd) in enumerate(feats):
     col = i % 3; row = i // 3
     _card(sl,
-          left=Inches(0.45+col*4.28),
-          top=Inches(1.52+row*1.95),
+          left=lefts[col],
+          top=tops[row],
           width=Inches(3.95), height=Inches(1.75),
           icon=ic, title=tt, body=dd)
 
@@ -234,7 +257,7 @@ steps = [
 ]
 for i, (num, title, body) in enumerate(steps):
     left = Inches(0.5 + i * 4.27)
-    _rect(sl, left, Inches(1.6), Inches(3.95), Inches(4.2), RGBColor(0x14,0x14,0x55))
+    _rect(sl, left, Inches(1.6), Inches(3.95), Inches(4.2), NAVY_CARD)
     circle = sl.shapes.add_shape(9, left+Inches(1.55), Inches(1.8), Inches(0.85), Inches(0.85))
     circle.fill.solid(); circle.fill.fore_color.rgb = ORANGE; circle.line.fill.background()
     _txt(sl, num, left+Inches(1.55), Inches(1.8), Inches(0.85), Inches(0.85),
@@ -244,8 +267,7 @@ for i, (num, title, body) in enumerate(steps):
     _txt(sl, body, left+Inches(0.2), Inches(3.45), Inches(3.55), Inches(2.1),
          size=10, color=GRAY, align=PP_ALIGN.CENTER)
 
-_rect(sl, Inches(3.5), Inches(6.15), Inches(6.33), Inches(0.85),
-      RGBColor(0xF4,0x79,0x20))
+_rect(sl, Inches(3.5), Inches(6.15), Inches(6.33), Inches(0.85), ORANGE)
 _txt(sl, "🔗  github.com/Parsa-Hajian/campaign-analytics-lab  ·  Open source",
      Inches(3.5), Inches(6.22), Inches(6.33), Inches(0.6),
      size=11, bold=True, color=WHITE, align=PP_ALIGN.CENTER)
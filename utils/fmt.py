@@ -1,11 +1,25 @@
+import numpy as np
+import pandas as pd
+
+
+# Bound str.format methods of module-level templates: no per-call closure frame.
+_FMT = {
+    "Revenue": "€{:,.0f}".format,
+    "CR":      "{:.2%}".format,
+    "AOV":     "€{:.2f}".format,
+}
+_FMT_DEFAULT = "{:,.0f}".format   # volumes: Sessions, Conversions
+
+
 def _fmt(label, val):
-    if label in ("Revenue",):  return f"€{val:,.0f}"
-    if label == "CR":           return f"{val:.2%}"
-    if label == "AOV":          return f"€{val:.2f}"
-    return f"{val:,.0f}"
+    return _FMT.get(label, _FMT_DEFAULT)(val)
+
 
+def color_neg_series(s):
+    """Styler.apply rule: negative numbers bold red, everything else green.
 
-def color_neg(val):
-    if isinstance(val, (int, float)) and val < 0:
-        return "color: red; font-weight: bold"
-    return "color: green"
+    One vectorized comparison per column; non-numeric cells count as non-negative.
+    """
+    neg = pd.to_numeric(s, errors="coerce").to_numpy() < 0
+    return pd.Series(np.where(neg, "color: red; font-weight: bold", "color: green"),
+                     index=s.index)
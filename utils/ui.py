@@ -0,0 +1,16 @@
+import streamlit as st
+
+
+# st.fragment (1.37+) reruns only the decorated function when a widget inside it
+# changes; older releases call it experimental_fragment, or lack it (plain call).
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda f: f)
+
+
+def _reuse_figure(slot, sig):
+    """Figure kept in session_state[slot] if it was built for `sig`, else None.
+
+    Callers store (sig, figure) back under `slot` after a rebuild, so charts whose
+    inputs are unchanged are handed back as-is instead of rebuilt on every rerun.
+    """
+    hit = st.session_state.get(slot)
+    return hit[1] if hit is not None and hit[0] == sig else None
@@ -1,10 +1,14 @@
 """Main dashboard: Projection Overview, Goal Tracker, DNA Profile."""
 import streamlit as st
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from datetime import timedelta
 
-from utils.fmt import _fmt, color_neg
+from engine.simulation import _day_keys, _day_key
+from utils.fmt import _fmt, color_neg_series
+from utils.ui import _fragment, _reuse_figure
 
 _C_BASE   = "#94a3b8"
 _C_SIM    = "#1a1a6b"
@@ -12,39 +16,272 @@ _C_BAND   = "rgba(26,26,107,0.12)"
 _C_TARGET = "#dc2626"
 _C_SHOCK  = "rgba(220,38,38,0.10)"
 _TEMPLATE = "plotly_white"
+_LEGEND_TOP = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+
+# Fixed layout parts, validated (and the template resolved) once at import; each
+# figure copies one and only sets its title / metric-dependent fields.
+_LAYOUT_PROJECTION = go.Layout(template=_TEMPLATE, xaxis_title="Date",
+                               legend=_LEGEND_TOP, hovermode="x unified")
+_LAYOUT_TARGET = go.Layout(template=_TEMPLATE, height=350,
+                           legend=_LEGEND_TOP, hovermode="x unified")
+_LAYOUT_GAP    = go.Layout(template=_TEMPLATE, barmode="group", height=280)
+_LAYOUT_DNA    = go.Layout(template=_TEMPLATE, legend=_LEGEND_TOP, hovermode="x unified",
+                           yaxis_title="Index (1.0 = historical median)")
+
+# Long series (Daily resolution) render through WebGL; short ones stay SVG so the
+# page doesn't spend browser WebGL contexts on 12- or 53-point charts.
+_GL_MIN_POINTS = 300
+
+# Goal Tracker table: longer tables skip the Styler (see render_dashboard).
+_STYLED_MAX_ROWS = 60
+
+
+def _scatter_cls(n_points):
+    return go.Scattergl if n_points >= _GL_MIN_POINTS else go.Scatter
 
 
 def _add_shock_markers(fig, event_log):
+    """Shade campaign / injection windows, appended to the layout in one assignment
+    (add_vrect per event re-validates the whole shapes tuple each time)."""
+    shapes, notes = [], []
     for ev in event_log:
         if ev["type"] == "shock":
-            fig.add_vrect(
-                x0=str(ev["start"]), x1=str(ev["end"]),
-                fillcolor=_C_SHOCK, layer="below", line_width=0,
-                annotation_text=f"📣 {ev.get('shape','')[:12]}",
-                annotation_position="top left",
-                annotation=dict(font_size=10, font_color="#dc2626"),
-            )
+            x0, x1, fill = str(ev["start"]), str(ev["end"]), _C_SHOCK
+            note = dict(text=f"📣 {ev.get('shape','')[:12]}", font=dict(size=10, color="#dc2626"))
         elif ev["type"] == "reapplied_shock":
-            from datetime import timedelta
             end_d = ev["new_start"] + timedelta(days=ev["duration"] - 1)
-            fig.add_vrect(
-                x0=str(ev["new_start"]), x1=str(end_d),
-                fillcolor="rgba(16,185,129,0.10)", layer="below", line_width=0,
-                annotation_text="💉", annotation_position="top left",
-                annotation=dict(font_size=10),
-            )
+            x0, x1, fill = str(ev["new_start"]), str(end_d), "rgba(16,185,129,0.10)"
+            note = dict(text="💉", font=dict(size=10))
+        else:
+            continue
+        shapes.append(dict(type="rect", x0=x0, x1=x1, xref="x", y0=0, y1=1, yref="y domain",
+                           fillcolor=fill, layer="below", line=dict(width=0)))
+        notes.append(dict(x=x0, xref="x", y=1, yref="y domain", xanchor="left",
+                          yanchor="top", showarrow=False, **note))
+    if shapes:
+        fig.layout.shapes      = fig.layout.shapes + tuple(shapes)
+        fig.layout.annotations = fig.layout.annotations + tuple(notes)
+
+
+# ── Cached aggregations ─────────────────────────────────────────────────────────
+# Keyed on `proj_key` (the projection inputs, see app.py) rather than on the frame
+# itself: leading-underscore args are not hashed, so reruns that leave the
+# projection unchanged (metric / radio / target edits) skip the groupbys.
+
+# The year frame is built in date order, so sort=False keeps groups in order of first
+# appearance — chronological on the Date x-axis — without a post-aggregation sort.
+# That is not period order: years starting inside ISO week 52/53 (e.g. 2023) group as
+# [52, 1, 2, …], so charts whose x-axis is the period number sort by it first.
+_VARIANTS = ["Base", "Sim", "Base_Min", "Base_Max", "Sim_Min", "Sim_Max"]
+
+
+def _ratio(num, den):
+    """num / den with 0 wherever the denominator is 0 (no inf / NaN)."""
+    return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+
+def _to_float32(frame):
+    """Downcast float64 columns of a plot-only frame: halves the typed-array payload
+    Plotly ships to the browser, and 7 significant digits are plenty for a chart."""
+    return frame.astype({c: "float32" for c in frame.select_dtypes("float64").columns})
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _agg_periods(proj_key, time_col, _df):
+    """Per-period projection sums (+ CR / AOV) and DNA index means, from one groupby
+    shared by the Projection Overview and DNA Profile tabs.
+
+    Rows are in date order (see above); the DNA Profile sorts them by period itself.
+    """
+    agg_cols = {
+        "Date": "first",
+        **{f"{m}_{v}": "sum" for m in ["Sessions", "Conversions", "Revenue"] for v in _VARIANTS},
+        **{f"idx_{m}_{l}": "mean" for l in ["pure", "pretrial", "work"] for m in ["sessions", "cr", "aov"]},
+    }
+    agg_df = _df.groupby(time_col, sort=False, observed=True, as_index=False).agg(agg_cols)
+
+    # CR / AOV for all six variants at once on (G, 6) blocks.
+    sess = agg_df[[f"Sessions_{v}"    for v in _VARIANTS]].to_numpy(dtype=float)
+    conv = agg_df[[f"Conversions_{v}" for v in _VARIANTS]].to_numpy(dtype=float)
+    rev  = agg_df[[f"Revenue_{v}"     for v in _VARIANTS]].to_numpy(dtype=float)
+    agg_df[[f"CR_{v}"  for v in _VARIANTS]] = _ratio(conv, sess)
+    agg_df[[f"AOV_{v}" for v in _VARIANTS]] = _ratio(rev, conv)
+    return _to_float32(agg_df)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _agg_target(proj_key, time_col, tgt_start, tgt_end, _df):
+    """Target-period totals and per-period sums, or None if the period has no rows.
+
+    totals is (sessions, conversions, revenue) Sim followed by the same three Base sums.
+    """
+    # int64 day-number compare instead of two per-row datetime.date conversions.
+    days = _day_keys(_df["Date"])
+    rows = np.flatnonzero((days >= _day_key(tgt_start)) & (days <= _day_key(tgt_end)))
+    if not len(rows):
+        return None
+
+    sum_cols = ["Sessions_Sim", "Conversions_Sim", "Revenue_Sim",
+                "Sessions_Base", "Conversions_Base", "Revenue_Base"]
+    vals   = _df[sum_cols].to_numpy(dtype=float)[rows]
+    totals = tuple(vals.sum(axis=0).tolist())
+
+    # Group sums as one bincount per column over first-appearance period codes, i.e.
+    # date order like _agg_periods: right for these Date-axis charts, not period order.
+    codes, periods = pd.factorize(_df[time_col].to_numpy()[rows])
+    first = np.unique(codes, return_index=True)[1]
+    agg_tgt = pd.DataFrame({
+        time_col: periods,
+        "Date":   _df["Date"].to_numpy()[rows[first]],
+        **{c: np.bincount(codes, weights=vals[:, j], minlength=len(periods))
+           for j, c in enumerate(sum_cols)},
+    })
+    return totals, agg_tgt
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _brand_history(brand, _yearly_kpis):
+    """One brand's yearly KPI rows sorted by Year, plus a {Year: {metric: value}} lookup.
+
+    yearly_kpis is the process-wide frame from app.load_data, so the brand alone keys it.
+    """
+    brand_hist = _yearly_kpis[_yearly_kpis["brand"] == brand].sort_values("Year")
+    return brand_hist, brand_hist.set_index("Year").to_dict("index")
+
+
+# ── Chart fragments ─────────────────────────────────────────────────────────────
+# The metric selector / radio live inside these, so switching them redraws one
+# chart instead of rerunning the page (and the projection) from the top.
+
+# Variant columns behind each forecast trace, in trace order.
+_PROJ_SERIES = {
+    True:  ["Base_Max", "Base_Min", "Base", "Sim_Max", "Sim_Min", "Sim"],
+    False: ["Base_Max", "Base_Min", "Base"],
+}
+
+
+@_fragment
+def _projection_chart(agg_df, event_log, res_level, sig):
+    """Tab 1 metric selector + forecast chart; a metric change reruns only this.
+
+    `sig` identifies agg_df: while it is unchanged the session's figure is reused and
+    only its y arrays and titles are swapped for the selected metric.
+    """
+    has_events = bool(event_log)
+    met = st.selectbox("Select Metric", ["Revenue", "Sessions", "Conversions", "CR", "AOV"])
+
+    fig = _reuse_figure("_proj_fig", sig)
+    if fig is None:
+        Scatter = _scatter_cls(len(agg_df))
+        x = agg_df["Date"]
+        if has_events:
+            traces = [
+                Scatter(x=x, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"),
+                Scatter(x=x, mode="lines", line=dict(width=0),
+                        fill="tonexty", fillcolor="rgba(148,163,184,0.15)",
+                        name="±15% Baseline Band"),
+                Scatter(x=x, mode="lines", line=dict(color=_C_BASE, dash="dot", width=2),
+                        name="Baseline (No Events)"),
+                Scatter(x=x, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"),
+                Scatter(x=x, mode="lines", line=dict(width=0),
+                        fill="tonexty", fillcolor=_C_BAND, name="±15% Forecast Band"),
+                Scatter(x=x, mode="lines+markers", line=dict(color=_C_SIM, width=3),
+                        name="Forecast (With Events)"),
+            ]
+        else:
+            traces = [
+                Scatter(x=x, mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"),
+                Scatter(x=x, mode="lines", line=dict(width=0),
+                        fill="tonexty", fillcolor="rgba(148,163,184,0.15)", name="±15% Range"),
+                Scatter(x=x, mode="lines+markers", line=dict(color=_C_BASE, width=3),
+                        name="Baseline"),
+            ]
+        fig = go.Figure(data=traces, layout=_LAYOUT_PROJECTION)
+        if has_events:
+            _add_shock_markers(fig, event_log)
+        st.session_state["_proj_fig"] = (sig, fig)
+
+    with fig.batch_update():
+        for trace, v in zip(fig.data, _PROJ_SERIES[has_events]):
+            trace.y = agg_df[f"{met}_{v}"]
+        fig.layout.title = dict(text=f"{res_level} Forecast — {met}",
+                                font=dict(size=18, color="#12124a"))
+        fig.layout.yaxis.title.text = met
+    st.plotly_chart(fig, use_container_width=True)
+    if has_events:
+        st.caption(
+            f"**{len(event_log)} event(s)** active — shaded bands show campaign windows. "
+            "Manage in ⚡ Lab → 📋 Audit.")
+
+
+@_fragment
+def _tracking_charts(agg_tgt, event_log, sig):
+    """Tab 2 metric radio + target / gap charts; a radio change reruns only this.
+
+    Same figure reuse as _projection_chart, with `sig` identifying agg_tgt.
+    """
+    has_events = bool(event_log)
+    gap_m = st.radio("Visualize Tracking For:", ["Revenue", "Conversions", "Sessions"], horizontal=True)
+
+    figs = _reuse_figure("_tracking_figs", sig)
+    if figs is None:
+        Scatter = _scatter_cls(len(agg_tgt))
+        x = agg_tgt["Date"]
+        ts_traces = [
+            Scatter(x=x, mode="lines", line=dict(color=_C_TARGET, dash="dash", width=2), name="Target"),
+            Scatter(x=x, mode="lines", line=dict(color=_C_BASE, dash="dot", width=2), name="Before"),
+        ]
+        gap_traces = [go.Bar(x=x, name="Gap (Before)", marker_color="#cbd5e1")]
+        if has_events:
+            ts_traces.append(Scatter(
+                x=x, mode="lines+markers", line=dict(color=_C_SIM, width=2), name="After"))
+            gap_traces.append(go.Bar(x=x, name="Gap (After)"))
+        figs = (go.Figure(data=ts_traces, layout=_LAYOUT_TARGET),
+                go.Figure(data=gap_traces, layout=_LAYOUT_GAP))
+        if has_events:
+            _add_shock_markers(figs[0], event_log)
+        st.session_state["_tracking_figs"] = (sig, figs)
+    fig_ts, fig_gap = figs
+
+    with fig_ts.batch_update():
+        for trace, col in zip(fig_ts.data, [f"Needed_{gap_m}", f"{gap_m}_Base", f"{gap_m}_Sim"]):
+            trace.y = agg_tgt[col]
+        fig_ts.layout.title = dict(text=f"Target vs Forecast — {gap_m}", font=dict(color="#12124a"))
+    st.plotly_chart(fig_ts, use_container_width=True)
+
+    with fig_gap.batch_update():
+        fig_gap.data[0].y = agg_tgt[f"Gap_{gap_m}_Base"]
+        if has_events:
+            gap_sim = agg_tgt[f"Gap_{gap_m}_Sim"]
+            fig_gap.data[1].y = gap_sim
+            fig_gap.data[1].marker.color = np.where(gap_sim.to_numpy() < 0, "#f87171", "#4ade80").tolist()
+        fig_gap.layout.title = dict(text=f"{gap_m} Surplus / Shortfall", font=dict(color="#12124a"))
+    st.plotly_chart(fig_gap, use_container_width=True)
+
+
+# Fallbacks when the page is rendered without app.py's session defaults; callables
+# build a fresh mutable value per session.
+_STATE_DEFAULTS = {
+    "event_log":     list,
+    "tgt_start":     None,
+    "tgt_end":       None,
+    "target_metric": "Revenue",
+    "target_val":    0.0,
+}
 
 
 def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
-                     base_cr, base_aov):
-    if "event_log"     not in st.session_state: st.session_state.event_log     = []
-    if "tgt_start"     not in st.session_state: st.session_state.tgt_start     = None
-    if "tgt_end"       not in st.session_state: st.session_state.tgt_end       = None
-    if "target_metric" not in st.session_state: st.session_state.target_metric = "Revenue"
-    if "target_val"    not in st.session_state: st.session_state.target_val    = 0.0
+                     base_cr, base_aov, proj_key):
+    for k, v in _STATE_DEFAULTS.items():
+        st.session_state.setdefault(k, v() if callable(v) else v)
+
+    if df.empty or not sel_brands:
+        st.info("Select at least one brand to see the dashboard.")
+        return
 
     event_log  = st.session_state.event_log
     has_events = bool(event_log)
+    agg_df     = _agg_periods(proj_key, time_col, df)
 
     tab1, tab2, tab3 = st.tabs([
         "📈 Projection Overview",
@@ -54,79 +291,7 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
 
     # ── Tab 1: Projection Overview ──────────────────────────────────────────────
     with tab1:
-        agg_cols = {
-            "Date": "first",
-            **{
-                f"{m}_{v}": "sum"
-                for m in ["Sessions", "Conversions", "Revenue"]
-                for v in ["Base", "Sim", "Base_Min", "Base_Max", "Sim_Min", "Sim_Max"]
-            },
-        }
-        agg_df = df.groupby(time_col).agg(agg_cols).reset_index()
-
-        for pfx in ["_Base", "_Sim", "_Base_Min", "_Base_Max", "_Sim_Min", "_Sim_Max"]:
-            agg_df[f"CR{pfx}"] = (
-                (agg_df[f"Conversions{pfx}"] / agg_df[f"Sessions{pfx}"])
-                .replace([float("inf"), float("-inf")], 0).fillna(0)
-            )
-            agg_df[f"AOV{pfx}"] = (
-                (agg_df[f"Revenue{pfx}"] / agg_df[f"Conversions{pfx}"])
-                .replace([float("inf"), float("-inf")], 0).fillna(0)
-            )
-
-        met = st.selectbox("Select Metric", ["Revenue", "Sessions", "Conversions", "CR", "AOV"])
-        fig = go.Figure()
-
-        if has_events:
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base_Max"],
-                mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base_Min"],
-                mode="lines", line=dict(width=0),
-                fill="tonexty", fillcolor="rgba(148,163,184,0.15)",
-                name="±15% Baseline Band"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base"],
-                mode="lines", line=dict(color=_C_BASE, dash="dot", width=2),
-                name="Baseline (No Events)"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Sim_Max"],
-                mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Sim_Min"],
-                mode="lines", line=dict(width=0),
-                fill="tonexty", fillcolor=_C_BAND, name="±15% Forecast Band"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Sim"],
-                mode="lines+markers", line=dict(color=_C_SIM, width=3),
-                name="Forecast (With Events)"))
-            _add_shock_markers(fig, event_log)
-        else:
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base_Max"],
-                mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base_Min"],
-                mode="lines", line=dict(width=0),
-                fill="tonexty", fillcolor="rgba(148,163,184,0.15)", name="±15% Range"))
-            fig.add_trace(go.Scatter(
-                x=agg_df["Date"], y=agg_df[f"{met}_Base"],
-                mode="lines+markers", line=dict(color=_C_BASE, width=3),
-                name="Baseline"))
-
-        fig.update_layout(
-            template=_TEMPLATE,
-            title=dict(text=f"{res_level} Forecast — {met}", font=dict(size=18, color="#12124a")),
-            xaxis_title="Date", yaxis_title=met,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            hovermode="x unified",
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        if has_events:
-            st.caption(
-                f"**{len(event_log)} event(s)** active — shaded bands show campaign windows. "
-                "Manage in ⚡ Lab → 📋 Audit.")
+        _projection_chart(agg_df, event_log, res_level, (proj_key, time_col))
 
     # ── Tab 3: Demand DNA Profile ────────────────────────────────────────────────
     # NOTE: processed before Tab 2 so early-return in Goal Tracker cannot block DNA Profile.
@@ -136,12 +301,6 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
             "Three layers: **Pure** (historical blend) · **Pre-Trial** (calibration state) · "
             "**Work** (final projection state after all modifications)")
 
-        dna_plot = df.groupby(time_col).agg({
-            "idx_sessions_pure": "mean", "idx_cr_pure": "mean", "idx_aov_pure": "mean",
-            "idx_sessions_pretrial": "mean", "idx_cr_pretrial": "mean", "idx_aov_pretrial": "mean",
-            "idx_sessions_work": "mean", "idx_cr_work": "mean", "idx_aov_work": "mean",
-        }).reset_index()
-
         _DNA_PURE     = [("#FCD34D", "Sessions"), ("#6EE7B7", "CR"), ("#C4B5FD", "AOV")]
         _DNA_PRETRIAL = [("#F97316", "Sessions"), ("#10B981", "CR"), ("#8B5CF6", "AOV")]
         _DNA_WORK     = [("#C2410C", "Sessions"), ("#065F46", "CR"), ("#5B21B6", "AOV")]
@@ -149,33 +308,36 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
         _DNA_COLS_PT  = ["idx_sessions_pretrial", "idx_cr_pretrial", "idx_aov_pretrial"]
         _DNA_COLS_W   = ["idx_sessions_work",     "idx_cr_work",     "idx_aov_work"]
 
-        fig_dna = go.Figure()
-        for col, (color, name) in zip(_DNA_COLS_P, _DNA_PURE):
-            fig_dna.add_trace(go.Scatter(
-                x=dna_plot[time_col], y=dna_plot[col],
-                mode="lines", line=dict(dash="dot", width=2, color=color),
-                name=f"{name} (Pure)"))
-
+        # All nine layer columns as one (G, 9) block; traces take column views of it.
+        # Rows in period order: the x-axis here is the period number, not the Date.
+        Scatter = _scatter_cls(len(agg_df))
+        order   = np.argsort(agg_df[time_col].to_numpy(), kind="stable")
+        x       = agg_df[time_col].to_numpy()[order]
+        dna_arr = agg_df[_DNA_COLS_P + _DNA_COLS_PT + _DNA_COLS_W].to_numpy()[order]
+        traces = [
+            Scatter(x=x, y=dna_arr[:, i],
+                    mode="lines", line=dict(dash="dot", width=2, color=color),
+                    name=f"{name} (Pure)")
+            for i, (color, name) in enumerate(_DNA_PURE)
+        ]
         if has_events:
-            for col, (color, name) in zip(_DNA_COLS_PT, _DNA_PRETRIAL):
-                fig_dna.add_trace(go.Scatter(
-                    x=dna_plot[time_col], y=dna_plot[col],
-                    mode="lines", line=dict(dash="dash", width=2.5, color=color),
-                    name=f"{name} (Pre-Trial)"))
-            for col, (color, name) in zip(_DNA_COLS_W, _DNA_WORK):
-                fig_dna.add_trace(go.Scatter(
-                    x=dna_plot[time_col], y=dna_plot[col],
-                    mode="lines+markers",
-                    line=dict(width=3.5, color=color), marker=dict(size=5, color=color),
-                    name=f"{name} (Work)"))
+            traces += [
+                Scatter(x=x, y=dna_arr[:, 3 + i],
+                        mode="lines", line=dict(dash="dash", width=2.5, color=color),
+                        name=f"{name} (Pre-Trial)")
+                for i, (color, name) in enumerate(_DNA_PRETRIAL)
+            ]
+            traces += [
+                Scatter(x=x, y=dna_arr[:, 6 + i],
+                        mode="lines+markers",
+                        line=dict(width=3.5, color=color), marker=dict(size=5, color=color),
+                        name=f"{name} (Work)")
+                for i, (color, name) in enumerate(_DNA_WORK)
+            ]
 
+        fig_dna = go.Figure(data=traces, layout=_LAYOUT_DNA)
         fig_dna.update_layout(
-            template=_TEMPLATE,
-            title=dict(text=f"DNA Profile — {res_level} Resolution", font=dict(color="#12124a")),
-            hovermode="x unified",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            yaxis_title="Index (1.0 = historical median)",
-        )
+            title=dict(text=f"DNA Profile — {res_level} Resolution", font=dict(color="#12124a")))
         st.plotly_chart(fig_dna, use_container_width=True)
 
         if has_events:
@@ -196,7 +358,7 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
 
         if len(sel_brands) == 1:
             st.info(f"📈 **Single Entity Mode:** {sel_brands[0].title()}")
-            brand_hist = yearly_kpis[yearly_kpis["brand"] == sel_brands[0]].sort_values("Year")
+            brand_hist, hist_by_year = _brand_history(sel_brands[0], yearly_kpis)
 
             h1, h2, h3 = st.columns(3)
             hist_year         = h1.selectbox("Base Year", brand_hist["Year"].unique())
@@ -225,7 +387,7 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
                     use_container_width=True, hide_index=True,
                 )
 
-            base_hist = brand_hist[brand_hist["Year"] == hist_year][target_metric_raw].values[0]
+            base_hist = hist_by_year[hist_year][target_metric_raw]
             calculated_target = base_hist * (1 + growth_pct / 100)
             if target_metric_raw == "cr":
                 st.success(f"Target: **{calculated_target:.2%}** {metric_map[target_metric_raw]}")
@@ -235,63 +397,61 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
                 st.success(f"Target: **{calculated_target:,.0f}** {metric_map[target_metric_raw]}")
             st.markdown("---")
 
-        col_d1, col_d2 = st.columns(2)
-        st.session_state.tgt_start = col_d1.date_input(
-            "Target Period Start", st.session_state.tgt_start)
-        st.session_state.tgt_end   = col_d2.date_input(
-            "Target Period End",   st.session_state.tgt_end)
-
-        col_m1, col_m2, col_m3 = st.columns(3)
-        m_opts = ["Revenue", "Conversions", "Sessions", "CR", "AOV"]
-        default_idx = (
-            m_opts.index(metric_map[target_metric_raw])
-            if len(sel_brands) == 1 and metric_map[target_metric_raw] in m_opts
-            else m_opts.index(st.session_state.target_metric)
-            if st.session_state.target_metric in m_opts else 0
-        )
-        st.session_state.target_metric = col_m1.selectbox(
-            "Final Target Metric", m_opts, index=default_idx)
-
-        volume_driver = "Traffic (Sessions)"
-        if st.session_state.target_metric in ["Revenue", "Conversions"]:
-            d_opts = (
-                ["Traffic (Sessions)", "Conversion Rate (CR)", "Avg. Order Value (AOV)"]
-                if st.session_state.target_metric == "Revenue"
-                else ["Traffic (Sessions)", "Conversion Rate (CR)"]
-            )
-            volume_driver = col_m2.selectbox("Scale via:", d_opts)
-
-        if st.session_state.target_metric == "CR":
-            st.session_state.target_val = col_m3.number_input(
-                "Desired CR",
-                value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
-                step=0.0001, format="%.4f",
-            )
-        elif st.session_state.target_metric == "AOV":
-            st.session_state.target_val = col_m3.number_input(
-                "Desired AOV (€)",
-                value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
-                step=1.0,
-            )
-        else:
-            st.session_state.target_val = col_m3.number_input(
-                f"Desired {st.session_state.target_metric}",
-                value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
-                step=1000.0,
+        # One rerun per "Recalculate" instead of one per keystroke / date pick.
+        with st.form("goal_tracker_inputs", border=False):
+            col_d1, col_d2 = st.columns(2)
+            st.session_state.tgt_start = col_d1.date_input(
+                "Target Period Start", st.session_state.tgt_start)
+            st.session_state.tgt_end   = col_d2.date_input(
+                "Target Period End",   st.session_state.tgt_end)
+
+            col_m1, col_m2, col_m3 = st.columns(3)
+            m_opts = ["Revenue", "Conversions", "Sessions", "CR", "AOV"]
+            default_idx = (
+                m_opts.index(metric_map[target_metric_raw])
+                if len(sel_brands) == 1 and metric_map[target_metric_raw] in m_opts
+                else m_opts.index(st.session_state.target_metric)
+                if st.session_state.target_metric in m_opts else 0
             )
+            st.session_state.target_metric = col_m1.selectbox(
+                "Final Target Metric", m_opts, index=default_idx)
+
+            volume_driver = "Traffic (Sessions)"
+            if st.session_state.target_metric in ["Revenue", "Conversions"]:
+                d_opts = (
+                    ["Traffic (Sessions)", "Conversion Rate (CR)", "Avg. Order Value (AOV)"]
+                    if st.session_state.target_metric == "Revenue"
+                    else ["Traffic (Sessions)", "Conversion Rate (CR)"]
+                )
+                volume_driver = col_m2.selectbox("Scale via:", d_opts)
 
-        df_tgt = df[
-            (df["Date"].dt.date >= st.session_state.tgt_start) &
-            (df["Date"].dt.date <= st.session_state.tgt_end)
-        ].copy()
+            if st.session_state.target_metric == "CR":
+                st.session_state.target_val = col_m3.number_input(
+                    "Desired CR",
+                    value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
+                    step=0.0001, format="%.4f",
+                )
+            elif st.session_state.target_metric == "AOV":
+                st.session_state.target_val = col_m3.number_input(
+                    "Desired AOV (€)",
+                    value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
+                    step=1.0,
+                )
+            else:
+                st.session_state.target_val = col_m3.number_input(
+                    f"Desired {st.session_state.target_metric}",
+                    value=float(calculated_target if len(sel_brands) == 1 else st.session_state.target_val),
+                    step=1000.0,
+                )
+            st.form_submit_button("Recalculate")
 
-        if df_tgt.empty:
+        tgt = _agg_target(proj_key, time_col,
+                          st.session_state.tgt_start, st.session_state.tgt_end, df)
+        if tgt is None:
             st.warning("Target period has no data in the projection year. Adjust the dates above.")
             return
-
-        tgt_rev_base  = df_tgt["Revenue_Base"].sum()
-        tgt_conv_base = df_tgt["Conversions_Base"].sum()
-        tgt_sess_base = df_tgt["Sessions_Base"].sum()
+        totals, agg_tgt = tgt
+        s_s, s_c, s_r, tgt_sess_base, tgt_conv_base, tgt_rev_base = totals
         tgt_eff_aov   = tgt_rev_base  / tgt_conv_base if tgt_conv_base > 0 else base_aov
         tgt_eff_cr    = tgt_conv_base / tgt_sess_base if tgt_sess_base > 0 else base_cr
 
@@ -327,9 +487,6 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
         needed_cr  = needed_conv / needed_sess if needed_sess > 0 else 0
         needed_aov = needed_rev  / needed_conv if needed_conv > 0 else 0
 
-        s_s   = df_tgt["Sessions_Sim"].sum()
-        s_c   = df_tgt["Conversions_Sim"].sum()
-        s_r   = df_tgt["Revenue_Sim"].sum()
         s_cr  = s_c / s_s if s_s > 0 else 0
         s_aov = s_r / s_c if s_c > 0 else 0
 
@@ -347,61 +504,20 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
                 sign  = "+" if delta >= 0 else ""
                 col.caption(f"**After:** {_fmt(lbl, a_v)} *(Δ {sign}{_fmt(lbl, delta)})*")
 
-        agg_tgt = df_tgt.groupby(time_col).agg({
-            "Date": "first",
-            "Sessions_Sim": "sum", "Conversions_Sim": "sum", "Revenue_Sim": "sum",
-            "Sessions_Base": "sum", "Conversions_Base": "sum", "Revenue_Base": "sum",
-        }).reset_index()
-
-        for col_n, total in [("Needed_Revenue", needed_rev),
-                              ("Needed_Conversions", needed_conv),
-                              ("Needed_Sessions",   needed_sess)]:
-            base_c = col_n.replace("Needed_", "") + "_Base"
-            bt = agg_tgt[base_c].sum()
-            agg_tgt[col_n] = total * (agg_tgt[base_c] / bt) if bt > 0 else 0
-
-        for sfx in ["Base", "Sim"]:
-            agg_tgt[f"Gap_Revenue_{sfx}"]     = agg_tgt[f"Revenue_{sfx}"]     - agg_tgt["Needed_Revenue"]
-            agg_tgt[f"Gap_Conversions_{sfx}"] = agg_tgt[f"Conversions_{sfx}"] - agg_tgt["Needed_Conversions"]
-            agg_tgt[f"Gap_Sessions_{sfx}"]    = agg_tgt[f"Sessions_{sfx}"]    - agg_tgt["Needed_Sessions"]
+        # Needed split pro rata to each period's baseline share, then Base / Sim gaps,
+        # on (G, 3) Revenue / Conversions / Sessions blocks.
+        _GAP_M = ["Revenue", "Conversions", "Sessions"]
+        base_blk = agg_tgt[[f"{m}_Base" for m in _GAP_M]].to_numpy(dtype=float)
+        sim_blk  = agg_tgt[[f"{m}_Sim"  for m in _GAP_M]].to_numpy(dtype=float)
+        need_blk = np.array([needed_rev, needed_conv, needed_sess]) * _ratio(base_blk, base_blk.sum(axis=0))
+        agg_tgt[[f"Needed_{m}" for m in _GAP_M]] = need_blk
+        agg_tgt[[f"Gap_{m}_Base" for m in _GAP_M]] = base_blk - need_blk
+        agg_tgt[[f"Gap_{m}_Sim"  for m in _GAP_M]] = sim_blk  - need_blk
 
         st.markdown("---")
-        gap_m = st.radio("Visualize Tracking For:", ["Revenue", "Conversions", "Sessions"], horizontal=True)
-
-        fig_ts = go.Figure()
-        fig_ts.add_trace(go.Scatter(
-            x=agg_tgt["Date"], y=agg_tgt[f"Needed_{gap_m}"],
-            mode="lines", line=dict(color=_C_TARGET, dash="dash", width=2), name="Target"))
-        fig_ts.add_trace(go.Scatter(
-            x=agg_tgt["Date"], y=agg_tgt[f"{gap_m}_Base"],
-            mode="lines", line=dict(color=_C_BASE, dash="dot", width=2), name="Before"))
-        if has_events:
-            fig_ts.add_trace(go.Scatter(
-                x=agg_tgt["Date"], y=agg_tgt[f"{gap_m}_Sim"],
-                mode="lines+markers", line=dict(color=_C_SIM, width=2), name="After"))
-            _add_shock_markers(fig_ts, event_log)
-        fig_ts.update_layout(
-            template=_TEMPLATE, height=350,
-            title=dict(text=f"Target vs Forecast — {gap_m}", font=dict(color="#12124a")),
-            hovermode="x unified",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        )
-        st.plotly_chart(fig_ts, use_container_width=True)
-
-        fig_gap = go.Figure()
-        fig_gap.add_trace(go.Bar(
-            x=agg_tgt["Date"], y=agg_tgt[f"Gap_{gap_m}_Base"],
-            name="Gap (Before)", marker_color="#cbd5e1"))
-        if has_events:
-            colors = ["#f87171" if v < 0 else "#4ade80" for v in agg_tgt[f"Gap_{gap_m}_Sim"]]
-            fig_gap.add_trace(go.Bar(
-                x=agg_tgt["Date"], y=agg_tgt[f"Gap_{gap_m}_Sim"],
-                name="Gap (After)", marker_color=colors))
-        fig_gap.update_layout(
-            template=_TEMPLATE, barmode="group", height=280,
-            title=dict(text=f"{gap_m} Surplus / Shortfall", font=dict(color="#12124a")),
-        )
-        st.plotly_chart(fig_gap, use_container_width=True)
+        _tracking_charts(agg_tgt, event_log,
+                         (proj_key, time_col, st.session_state.tgt_start, st.session_state.tgt_end,
+                          needed_rev, needed_conv, needed_sess))
 
         if has_events:
             disp_cols = [
@@ -424,8 +540,11 @@ def render_dashboard(df, profiles, yearly_kpis, sel_brands, res_level, time_col,
             ]
             gap_cols = ["Gap_Revenue_Base", "Gap_Conversions_Base", "Gap_Sessions_Base"]
 
-        disp_df = agg_tgt[disp_cols].copy()
-        try:
-            st.dataframe(disp_df.style.map(color_neg, subset=gap_cols), use_container_width=True)
-        except AttributeError:
-            st.dataframe(disp_df.style.applymap(color_neg, subset=gap_cols), use_container_width=True)
+        disp_df = agg_tgt[disp_cols]
+        if len(disp_df) <= _STYLED_MAX_ROWS:
+            st.dataframe(disp_df.style.apply(color_neg_series, subset=gap_cols), use_container_width=True)
+        else:
+            # Daily resolution: a Styler serialises per-cell CSS for every row, so ship the
+            # raw frame and let the grid format numbers client-side (no red/green).
+            st.dataframe(disp_df, use_container_width=True, column_config={
+                c: st.column_config.NumberColumn(format="%.2f") for c in disp_cols[1:]})
@@ -7,26 +7,126 @@ import plotly.graph_objects as go
 _TMPL = "plotly_white"
 _C_SIM = "#1a1a6b"
 
-
+# Static reference tables (Models & Formulas / How to Use), built once at import.
+_SHAPES_DF = pd.DataFrame({
+    "Shape":    ["Email Campaign", "Flash Sale", "Product Launch", "Awareness Drive"],
+    "Type":     ["Front-Loaded", "Linear Fade", "Delayed Peak", "Step"],
+    "Formula":  [
+        "lift × e^(−3p)",
+        "lift × (1 − p)",
+        "lift × exp(−((t − 0.4d)² / (2(0.3d)²)))",
+        "lift × 1",
+    ],
+    "Best for": [
+        "Email blasts, push notifications",
+        "Discount promotions, clearance sales",
+        "New product launches, reveals",
+        "Brand campaigns, outdoor, field activities",
+    ],
+})
+
+_SCHEMA_DF = pd.DataFrame({
+    "Column":      ["Date", "brand", "sessions", "conversions", "revenue", "cr", "aov", "campaign", "campaign_volume"],
+    "Type":        ["YYYY-MM-DD", "string", "int", "int", "float", "float (0–1)", "float", "string", "string"],
+    "Description": [
+        "Calendar date",
+        "Entity identifier (lowercase)",
+        "Total sessions / visits for that day",
+        "Total conversions (purchases, leads, etc.)",
+        "Total revenue from conversions",
+        "CR = conversions / sessions",
+        "AOV = revenue / conversions",
+        "'yes'/'no' — whether a campaign ran that day",
+        "Campaign type label (or 'no-campaign')",
+    ],
+})
+
+
+# Three-card rows (Architecture layers, core metrics) as one grid each: a single
+# markdown element instead of st.columns(3) + three. .docs-grid (assets/app.css)
+# stacks the cards into one column on narrow screens, as st.columns did.
+_GRID = "<div class='docs-grid'>"
+
+_LAYERS_HTML = (
+    _GRID +
+    "<div style='background:#EEF2FF;border-radius:10px;padding:16px 18px'>"
+    "<div style='font-size:1.4rem'>🧬</div>"
+    "<strong>Layer 1 — DNA</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>Historical demand pattern modeling. "
+    "Captures the seasonal shape of Sessions, CR, and AOV as normalized indices "
+    "at monthly, weekly, and daily granularity.</span>"
+    "</div>"
+    "<div style='background:#F0FDF4;border-radius:10px;padding:16px 18px'>"
+    "<div style='font-size:1.4rem'>🎯</div>"
+    "<strong>Layer 2 — Calibration</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>Anchors the model to current reality "
+    "using a known trial period. Computes base constants (base_sessions, base_CR, base_AOV) "
+    "that reconcile history with today's observations.</span>"
+    "</div>"
+    "<div style='background:#FFF7ED;border-radius:10px;padding:16px 18px'>"
+    "<div style='font-size:1.4rem'>📈</div>"
+    "<strong>Layer 3 — Simulation</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>Projects full-year performance and "
+    "applies campaign events (shocks, DNA adjustments, re-injections). "
+    "Shows Before/After views with ±15% confidence bands.</span>"
+    "</div>"
+    "</div>"
+)
+
+_METRICS_HTML = (
+    _GRID +
+    "<div style='background:#EEF2FF;border-radius:8px;padding:14px'>"
+    "<strong>Sessions</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>"
+    "Your primary <b>traffic / demand volume</b> metric. "
+    "This is the numerator in the CR calculation. "
+    "Should respond to campaign activity.<br><br>"
+    "<em>Examples: website sessions, store visits, app opens, "
+    "ad impressions (awareness campaigns), email deliveries.</em>"
+    "</span></div>"
+    "<div style='background:#F0FDF4;border-radius:8px;padding:14px'>"
+    "<strong>Conversions</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>"
+    "Your primary <b>conversion action</b>. "
+    "The denominator in AOV and numerator of CR.<br><br>"
+    "<em>Examples: purchases, leads submitted, sign-ups, "
+    "qualified appointments, units sold.</em>"
+    "</span></div>"
+    "<div style='background:#FFF7ED;border-radius:8px;padding:14px'>"
+    "<strong>Revenue</strong><br>"
+    "<span style='font-size:0.85rem;color:#555'>"
+    "The monetary value of your conversions. "
+    "Must equal Conversions × AOV within acceptable tolerance.<br><br>"
+    "<em>Examples: gross sales, net revenue, contract value, "
+    "subscription MRR.</em>"
+    "</span></div>"
+    "</div>"
+)
+
+
+@st.cache_resource(show_spinner=False)
 def _campaign_shape_fig():
-    """Render the 4 campaign shape curves on a single figure."""
+    """Render the 4 campaign shape curves on a single figure.
+
+    Static content, so it is built once per process and shared; st.plotly_chart only
+    serialises the figure and never mutates it.
+    """
     duration = 30
     t = np.arange(duration)
     p = t / duration
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=t, y=np.exp(-3.0 * p),
-        name="Email Campaign (Front-Loaded)", line=dict(width=2.5, color="#F47920")))
-    fig.add_trace(go.Scatter(
-        x=t, y=1 - p,
-        name="Flash Sale (Linear Fade)", line=dict(width=2.5, color="#10B981")))
-    fig.add_trace(go.Scatter(
-        x=t, y=np.exp(-((t - duration * 0.4) ** 2) / (2 * (duration * 0.3) ** 2)),
-        name="Product Launch (Delayed Peak)", line=dict(width=2.5, color="#8B5CF6")))
-    fig.add_trace(go.Scatter(
-        x=t, y=np.ones(duration),
-        name="Awareness Drive (Step)", line=dict(width=2.5, color="#EF4444")))
+    centered = p - 0.4                      # Delayed Peak: (t − 0.4d)/d, σ = 0.3 → 2σ² = 0.18
+
+    fig = go.Figure(data=[
+        go.Scatter(x=t, y=np.exp(-3.0 * p),
+                   name="Email Campaign (Front-Loaded)", line=dict(width=2.5, color="#F47920")),
+        go.Scatter(x=t, y=1.0 - p,
+                   name="Flash Sale (Linear Fade)", line=dict(width=2.5, color="#10B981")),
+        go.Scatter(x=t, y=np.exp(-(centered * centered) / 0.18),
+                   name="Product Launch (Delayed Peak)", line=dict(width=2.5, color="#8B5CF6")),
+        # Constant curve: two end points draw the same flat line.
+        go.Scatter(x=[0, duration - 1], y=[1, 1], mode="lines",
+                   name="Awareness Drive (Step)", line=dict(width=2.5, color="#EF4444")),
+    ])
 
     fig.update_layout(
         template=_TMPL, height=300,
@@ -38,19 +138,133 @@ def _campaign_shape_fig():
     return fig
 
 
+# ── Static section content ──────────────────────────────────────────────────────
+# (title, body) pairs, built once at import and iterated by render_docs. The long
+# st.markdown / st.code strings stay inline: literals are already code constants.
+
+_REQS = (
+    ("Minimum history",  "At least **12 months** of daily data per entity for reliable DNA. "
+                         "2+ years recommended."),
+    ("Metric consistency", "Your data must satisfy: **CR = Conversions ÷ Sessions** and "
+                           "**AOV = Revenue ÷ Conversions** consistently throughout."),
+    ("Daily granularity", "The transactions file must have one row per entity per calendar day. "
+                          "The DNA system aggregates up to Monthly/Weekly/Daily resolutions."),
+    ("Numeric stability", "Sessions should be > 0 for most days. Very sparse data (< 1 session/day "
+                          "on average) may produce unstable DNA indices."),
+)
+
+_ASSUMPTIONS = (
+    ("1. Demand shape stationarity",
+     "The seasonal pattern (shape) of Sessions, CR, and AOV is assumed stable across years. "
+     "Only the amplitude can change. If your business underwent a structural break "
+     "(e.g., entering a new market, major product pivot), the DNA from pre-break years "
+     "may distort the model. Use the DNA similarity weights display to check: "
+     "if one year has near-100% weight, earlier years are being discounted automatically."),
+    ("2. Additive campaign effects",
+     "Multiple campaign events are assumed to have **additive** effects on Sessions. "
+     "In reality, overlapping campaigns may have diminishing returns (saturation) "
+     "or amplifying effects (cross-channel synergy). The model does not model these interactions."),
+    ("3. 10th-percentile organic floor",
+     "In the De-Shock tool, the 10th percentile of Sessions within the shock window "
+     "is used as the organic baseline. This is **conservative**: it assumes the lowest "
+     "10% of traffic during the event period is organic. If events run for long periods, "
+     "this may underestimate organic traffic. For short, sharp events (< 2 weeks) it works well."),
+    ("4. ±15% uniform confidence margin",
+     "All projections carry a ±15% uncertainty band. This is a heuristic and does not reflect "
+     "actual statistical confidence intervals (which depend on data volume, noise level, and "
+     "structural stability). Higher-noise businesses or shorter trial periods warrant wider margins."),
+    ("5. Linear CR and AOV index scaling",
+     "Conversion Rate and Average Order Value scale multiplicatively with their DNA indices. "
+     "This implies that the CR and AOV shape is stable across time. "
+     "In practice, CR often varies with acquisition channel mix, which is not modeled here."),
+    ("6. Trial period representativeness",
+     "The trial period you select should represent **normal business conditions**. "
+     "Do not select a trial period that coincides with a major event (flash sale, "
+     "seasonal peak) unless you use the Pre-Adjustment feature to strip the lift. "
+     "An unrepresentative trial period will miscalibrate the entire projection."),
+    ("7. No external confounder modeling",
+     "The model does not account for: macroeconomic shocks, competitor actions, "
+     "platform algorithm changes, data pipeline interruptions, or major holidays not "
+     "already present in the historical pattern."),
+    ("8. Revenue identity",
+     "Revenue = Conversions × AOV is assumed throughout. "
+     "If your revenue data includes non-conversion sources (subscriptions, returns refunded, "
+     "etc.), the Revenue projections will be systematically biased."),
+    ("9. Day-of-week effects at monthly resolution",
+     "When using Monthly resolution, weekend suppression and weekday effects are averaged out. "
+     "Switch to Daily resolution to capture day-of-week patterns explicitly."),
+    ("10. Attribution is sequential, not causal",
+     "The Attribution Engine assigns credit in the order events were added to the log. "
+     "This is a sequential marginal contribution model, not a causal model. "
+     "Reordering events will change individual contributions. "
+     "For a more robust attribution, use Shapley-value averaging (not currently implemented)."),
+)
+
+_ISSUES = (
+    ("CR is very high (> 20%)",
+     "Check that Sessions and Conversions use the same definition. "
+     "If Sessions = add-to-cart events and Conversions = purchases, "
+     "CR will be inflated vs. site-wide CR. Use consistent definitions."),
+    ("AOV varies wildly by month",
+     "High AOV volatility may indicate mix shifts (product category changes, "
+     "currency effects). The DNA AOV index will capture this shape, "
+     "but consider whether it's structural or noise."),
+    ("Revenue doesn't match Sessions × CR × AOV",
+     "Revenue may include subscription revenue, returns/refunds, "
+     "or currency conversion effects. Ensure your Revenue column "
+     "is the gross transaction value from conversions only."),
+    ("DNA weights show 100% on one year",
+     "One year dominates because it was most similar to your trial period. "
+     "This is normal if that year had a very similar seasonal pattern. "
+     "If it seems wrong, check your trial period dates."),
+    ("Baseline projection seems too high/low",
+     "Re-check your trial period: total Sessions, Conversions, Revenue "
+     "must match what actually happened in those dates. "
+     "Also verify the Pre-Adjustment is set correctly."),
+)
+
+_TIPS = (
+    ("Start with one entity",
+     "Multi-entity DNA blending is powerful but harder to interpret. "
+     "Master the model on a single entity first, then explore combined views."),
+    ("Use Monthly resolution for strategy, Daily for execution",
+     "Monthly is faster, less noisy, and better for Q-level planning. "
+     "Switch to Daily when scheduling specific campaign dates."),
+    ("Calibrate on a quiet period",
+     "A 2–4 week period with no major campaigns, no anomalies, and complete data "
+     "gives the most reliable calibration. January is often good for seasonal businesses."),
+    ("Test campaign timing by shifting events",
+     "Use the Shift (↔) button to move a campaign window and instantly see "
+     "if an earlier or later date gives better goal coverage."),
+    ("Build a de-shock library before planning",
+     "Before your annual planning cycle, extract shock signatures for your "
+     "key recurring events (Black Friday, summer sale, product launch). "
+     "Then re-inject them to model next year."),
+    ("Review DNA weights each session",
+     "The sidebar shows DNA weights. If one year dominates (> 80%), "
+     "check if that year really was most similar to your current period. "
+     "If not, your trial dates or values may need adjustment."),
+)
+
+_SECTIONS = [
+    "🏗️ Architecture",
+    "📐 Models & Formulas",
+    "⚙️ Assumptions",
+    "📊 Metric Selection Guide",
+    "🚀 How to Use",
+]
+
+
 def render_docs():
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "🏗️ Architecture",
-        "📐 Models & Formulas",
-        "⚙️ Assumptions",
-        "📊 Metric Selection Guide",
-        "🚀 How to Use",
-    ])
+    # A radio instead of st.tabs: tabs run every body on each rerun, this builds only
+    # the section in view.
+    section = st.radio("Section", _SECTIONS, horizontal=True,
+                       key="docs_section", label_visibility="collapsed")
 
     # ─────────────────────────────────────────────────────────────────────────────
     # TAB 1: ARCHITECTURE
     # ─────────────────────────────────────────────────────────────────────────────
-    with tab1:
+    if section == _SECTIONS[0]:
         st.markdown("## Platform Architecture")
         st.markdown(
             "**Campaign Analytics Lab** is a decision-support platform for marketing and commercial teams. "
@@ -60,41 +274,7 @@ def render_docs():
 
         st.markdown("---")
         st.markdown("### Three-Layer Model")
-
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            st.markdown(
-                "<div style='background:#EEF2FF;border-radius:10px;padding:16px 18px'>"
-                "<div style='font-size:1.4rem'>🧬</div>"
-                "<strong>Layer 1 — DNA</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>Historical demand pattern modeling. "
-                "Captures the seasonal shape of Sessions, CR, and AOV as normalized indices "
-                "at monthly, weekly, and daily granularity.</span>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
-        with c2:
-            st.markdown(
-                "<div style='background:#F0FDF4;border-radius:10px;padding:16px 18px'>"
-                "<div style='font-size:1.4rem'>🎯</div>"
-                "<strong>Layer 2 — Calibration</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>Anchors the model to current reality "
-                "using a known trial period. Computes base constants (base_sessions, base_CR, base_AOV) "
-                "that reconcile history with today's observations.</span>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
-        with c3:
-            st.markdown(
-                "<div style='background:#FFF7ED;border-radius:10px;padding:16px 18px'>"
-                "<div style='font-size:1.4rem'>📈</div>"
-                "<strong>Layer 3 — Simulation</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>Projects full-year performance and "
-                "applies campaign events (shocks, DNA adjustments, re-injections). "
-                "Shows Before/After views with ±15% confidence bands.</span>"
-                "</div>",
-                unsafe_allow_html=True,
-            )
+        st.markdown(_LAYERS_HTML, unsafe_allow_html=True)
 
         st.markdown("---")
         st.markdown("### Data Flow")
@@ -153,7 +333,7 @@ Dashboard  ·  Lab  ·  Audit & Attribution""",
     # ─────────────────────────────────────────────────────────────────────────────
     # TAB 2: MODELS & FORMULAS
     # ─────────────────────────────────────────────────────────────────────────────
-    with tab2:
+    if section == _SECTIONS[1]:
         st.markdown("## Models & Formulas")
 
         st.markdown("### 1. DNA Similarity Weights")
@@ -222,25 +402,11 @@ Confidence margins: ±15% on all projected values.""",
             "Each campaign event distributes its traffic lift over the campaign window "
             "according to a shape function. `p = days_elapsed / duration`  (0 → 1)."
         )
-        st.plotly_chart(_campaign_shape_fig(), use_container_width=True)
-
-        shapes_df = pd.DataFrame({
-            "Shape":    ["Email Campaign", "Flash Sale", "Product Launch", "Awareness Drive"],
-            "Type":     ["Front-Loaded", "Linear Fade", "Delayed Peak", "Step"],
-            "Formula":  [
-                "lift × e^(−3p)",
-                "lift × (1 − p)",
-                "lift × exp(−((t − 0.4d)² / (2(0.3d)²)))",
-                "lift × 1",
-            ],
-            "Best for": [
-                "Email blasts, push notifications",
-                "Discount promotions, clearance sales",
-                "New product launches, reveals",
-                "Brand campaigns, outdoor, field activities",
-            ],
-        })
-        st.dataframe(shapes_df, use_container_width=True, hide_index=True)
+        # Illustration only: render as a static plot (no hover / zoom handlers, no modebar).
+        st.plotly_chart(_campaign_shape_fig(), use_container_width=True,
+                        config={"staticPlot": True})
+
+        st.dataframe(_SHAPES_DF, use_container_width=True, hide_index=True)
 
         st.markdown("### 6. De-Shock Isolation")
         st.info("**Goal:** separate the artificial (event-driven) component from the organic baseline.")
@@ -274,77 +440,18 @@ events are credited in the order they were added.""",
     # ─────────────────────────────────────────────────────────────────────────────
     # TAB 3: ASSUMPTIONS
     # ─────────────────────────────────────────────────────────────────────────────
-    with tab3:
+    if section == _SECTIONS[2]:
         st.markdown("## Model Assumptions & Requirements")
         st.warning(
             "All quantitative models rely on assumptions. Understanding these helps you "
             "interpret results correctly and know when the model may be less reliable.")
 
         st.markdown("### Data Requirements")
-        reqs = [
-            ("Minimum history",  "At least **12 months** of daily data per entity for reliable DNA. "
-                                 "2+ years recommended."),
-            ("Metric consistency", "Your data must satisfy: **CR = Conversions ÷ Sessions** and "
-                                   "**AOV = Revenue ÷ Conversions** consistently throughout."),
-            ("Daily granularity", "The transactions file must have one row per entity per calendar day. "
-                                  "The DNA system aggregates up to Monthly/Weekly/Daily resolutions."),
-            ("Numeric stability", "Sessions should be > 0 for most days. Very sparse data (< 1 session/day "
-                                  "on average) may produce unstable DNA indices."),
-        ]
-        for title, desc in reqs:
-            st.markdown(f"**{title}:** {desc}")
+        st.markdown("\n\n".join(f"**{title}:** {desc}" for title, desc in _REQS))
 
         st.markdown("---")
         st.markdown("### Model Assumptions")
-
-        assumptions = [
-            ("1. Demand shape stationarity",
-             "The seasonal pattern (shape) of Sessions, CR, and AOV is assumed stable across years. "
-             "Only the amplitude can change. If your business underwent a structural break "
-             "(e.g., entering a new market, major product pivot), the DNA from pre-break years "
-             "may distort the model. Use the DNA similarity weights display to check: "
-             "if one year has near-100% weight, earlier years are being discounted automatically."),
-            ("2. Additive campaign effects",
-             "Multiple campaign events are assumed to have **additive** effects on Sessions. "
-             "In reality, overlapping campaigns may have diminishing returns (saturation) "
-             "or amplifying effects (cross-channel synergy). The model does not model these interactions."),
-            ("3. 10th-percentile organic floor",
-             "In the De-Shock tool, the 10th percentile of Sessions within the shock window "
-             "is used as the organic baseline. This is **conservative**: it assumes the lowest "
-             "10% of traffic during the event period is organic. If events run for long periods, "
-             "this may underestimate organic traffic. For short, sharp events (< 2 weeks) it works well."),
-            ("4. ±15% uniform confidence margin",
-             "All projections carry a ±15% uncertainty band. This is a heuristic and does not reflect "
-             "actual statistical confidence intervals (which depend on data volume, noise level, and "
-             "structural stability). Higher-noise businesses or shorter trial periods warrant wider margins."),
-            ("5. Linear CR and AOV index scaling",
-             "Conversion Rate and Average Order Value scale multiplicatively with their DNA indices. "
-             "This implies that the CR and AOV shape is stable across time. "
-             "In practice, CR often varies with acquisition channel mix, which is not modeled here."),
-            ("6. Trial period representativeness",
-             "The trial period you select should represent **normal business conditions**. "
-             "Do not select a trial period that coincides with a major event (flash sale, "
-             "seasonal peak) unless you use the Pre-Adjustment feature to strip the lift. "
-             "An unrepresentative trial period will miscalibrate the entire projection."),
-            ("7. No external confounder modeling",
-             "The model does not account for: macroeconomic shocks, competitor actions, "
-             "platform algorithm changes, data pipeline interruptions, or major holidays not "
-             "already present in the historical pattern."),
-            ("8. Revenue identity",
-             "Revenue = Conversions × AOV is assumed throughout. "
-             "If your revenue data includes non-conversion sources (subscriptions, returns refunded, "
-             "etc.), the Revenue projections will be systematically biased."),
-            ("9. Day-of-week effects at monthly resolution",
-             "When using Monthly resolution, weekend suppression and weekday effects are averaged out. "
-             "Switch to Daily resolution to capture day-of-week patterns explicitly."),
-            ("10. Attribution is sequential, not causal",
-             "The Attribution Engine assigns credit in the order events were added to the log. "
-             "This is a sequential marginal contribution model, not a causal model. "
-             "Reordering events will change individual contributions. "
-             "For a more robust attribution, use Shapley-value averaging (not currently implemented)."),
-        ]
-
-        for title, desc in assumptions:
+        for title, desc in _ASSUMPTIONS:
             with st.expander(title):
                 st.markdown(desc)
 
@@ -365,7 +472,7 @@ events are credited in the order they were added.""",
     # ─────────────────────────────────────────────────────────────────────────────
     # TAB 4: METRIC SELECTION GUIDE
     # ─────────────────────────────────────────────────────────────────────────────
-    with tab4:
+    if section == _SECTIONS[3]:
         st.markdown("## Metric Selection Guide")
         st.markdown(
             "For the model to work correctly, your three core metrics must satisfy "
@@ -373,44 +480,7 @@ events are credited in the order they were added.""",
         )
 
         st.markdown("### The Three Core Metrics")
-        m1, m2, m3 = st.columns(3)
-        with m1:
-            st.markdown(
-                "<div style='background:#EEF2FF;border-radius:8px;padding:14px'>"
-                "<strong>Sessions</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>"
-                "Your primary <b>traffic / demand volume</b> metric. "
-                "This is the numerator in the CR calculation. "
-                "Should respond to campaign activity.<br><br>"
-                "<em>Examples: website sessions, store visits, app opens, "
-                "ad impressions (awareness campaigns), email deliveries.</em>"
-                "</span></div>",
-                unsafe_allow_html=True,
-            )
-        with m2:
-            st.markdown(
-                "<div style='background:#F0FDF4;border-radius:8px;padding:14px'>"
-                "<strong>Conversions</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>"
-                "Your primary <b>conversion action</b>. "
-                "The denominator in AOV and numerator of CR.<br><br>"
-                "<em>Examples: purchases, leads submitted, sign-ups, "
-                "qualified appointments, units sold.</em>"
-                "</span></div>",
-                unsafe_allow_html=True,
-            )
-        with m3:
-            st.markdown(
-                "<div style='background:#FFF7ED;border-radius:8px;padding:14px'>"
-                "<strong>Revenue</strong><br>"
-                "<span style='font-size:0.85rem;color:#555'>"
-                "The monetary value of your conversions. "
-                "Must equal Conversions × AOV within acceptable tolerance.<br><br>"
-                "<em>Examples: gross sales, net revenue, contract value, "
-                "subscription MRR.</em>"
-                "</span></div>",
-                unsafe_allow_html=True,
-            )
+        st.markdown(_METRICS_HTML, unsafe_allow_html=True)
 
         st.markdown("---")
         st.markdown("### Coherence Checklist")
@@ -467,36 +537,14 @@ Revenue = Sessions × CR × AOV     (the fundamental identity)""",
 
         st.markdown("---")
         st.markdown("### When Metrics Behave Unexpectedly")
-        issues = {
-            "CR is very high (> 20%)":
-                "Check that Sessions and Conversions use the same definition. "
-                "If Sessions = add-to-cart events and Conversions = purchases, "
-                "CR will be inflated vs. site-wide CR. Use consistent definitions.",
-            "AOV varies wildly by month":
-                "High AOV volatility may indicate mix shifts (product category changes, "
-                "currency effects). The DNA AOV index will capture this shape, "
-                "but consider whether it's structural or noise.",
-            "Revenue doesn't match Sessions × CR × AOV":
-                "Revenue may include subscription revenue, returns/refunds, "
-                "or currency conversion effects. Ensure your Revenue column "
-                "is the gross transaction value from conversions only.",
-            "DNA weights show 100% on one year":
-                "One year dominates because it was most similar to your trial period. "
-                "This is normal if that year had a very similar seasonal pattern. "
-                "If it seems wrong, check your trial period dates.",
-            "Baseline projection seems too high/low":
-                "Re-check your trial period: total Sessions, Conversions, Revenue "
-                "must match what actually happened in those dates. "
-                "Also verify the Pre-Adjustment is set correctly.",
-        }
-        for issue, solution in issues.items():
+        for issue, solution in _ISSUES:
             with st.expander(f"⚠️ {issue}"):
                 st.markdown(solution)
 
     # ─────────────────────────────────────────────────────────────────────────────
     # TAB 5: HOW TO USE
     # ─────────────────────────────────────────────────────────────────────────────
-    with tab5:
+    if section == _SECTIONS[4]:
         st.markdown("## Complete Usage Guide")
         st.info(
             "Follow these steps in order for your first session. "
@@ -518,22 +566,7 @@ Revenue = Sessions × CR × AOV     (the fundamental identity)""",
             "See the `generate_data.py` script for the expected column formats."
         )
         with st.expander("Column format reference"):
-            schema = pd.DataFrame({
-                "Column":      ["Date", "brand", "sessions", "conversions", "revenue", "cr", "aov", "campaign", "campaign_volume"],
-                "Type":        ["YYYY-MM-DD", "string", "int", "int", "float", "float (0–1)", "float", "string", "string"],
-                "Description": [
-                    "Calendar date",
-                    "Entity identifier (lowercase)",
-                    "Total sessions / visits for that day",
-                    "Total conversions (purchases, leads, etc.)",
-                    "Total revenue from conversions",
-                    "CR = conversions / sessions",
-                    "AOV = revenue / conversions",
-                    "'yes'/'no' — whether a campaign ran that day",
-                    "Campaign type label (or 'no-campaign')",
-                ],
-            })
-            st.dataframe(schema, use_container_width=True, hide_index=True)
+            st.dataframe(_SCHEMA_DF, use_container_width=True, hide_index=True)
 
         # ── STEP 2 ────────────────────────────────────────────────────────────────
         st.markdown("---")
@@ -713,28 +746,6 @@ Revenue = Sessions × CR × AOV     (the fundamental identity)""",
         # ── TIPS ──────────────────────────────────────────────────────────────────
         st.markdown("---")
         st.markdown("### Tips & Best Practices")
-        tips = [
-            ("Start with one entity",
-             "Multi-entity DNA blending is powerful but harder to interpret. "
-             "Master the model on a single entity first, then explore combined views."),
-            ("Use Monthly resolution for strategy, Daily for execution",
-             "Monthly is faster, less noisy, and better for Q-level planning. "
-             "Switch to Daily when scheduling specific campaign dates."),
-            ("Calibrate on a quiet period",
-             "A 2–4 week period with no major campaigns, no anomalies, and complete data "
-             "gives the most reliable calibration. January is often good for seasonal businesses."),
-            ("Test campaign timing by shifting events",
-             "Use the Shift (↔) button to move a campaign window and instantly see "
-             "if an earlier or later date gives better goal coverage."),
-            ("Build a de-shock library before planning",
-             "Before your annual planning cycle, extract shock signatures for your "
-             "key recurring events (Black Friday, summer sale, product launch). "
-             "Then re-inject them to model next year."),
-            ("Review DNA weights each session",
-             "The sidebar shows DNA weights. If one year dominates (> 80%), "
-             "check if that year really was most similar to your current period. "
-             "If not, your trial dates or values may need adjustment."),
-        ]
-        for title, desc in tips:
+        for title, desc in _TIPS:
             with st.expander(f"💡 {title}"):
                 st.markdown(desc)
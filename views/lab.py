@@ -6,16 +6,21 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import date, timedelta
 import time
+import json
 
 from config import EVENT_MAPPING
 from engine.dna import _apply_dna_ev, _periods_from_range
-from engine.simulation import get_shock_multiplier, eval_events
+from engine.simulation import (eval_events, eval_prefixes, shock_kernel, injection_block,
+                               _day_keys, _day_key)
 from engine.settings_store import load_settings, get_campaign_default
+from utils.ui import _fragment, _reuse_figure
 
 _C_BASE = "#94a3b8"
 _C_SIM  = "#1a1a6b"
 _TMPL   = "plotly_white"
 
+_ACTIONS_PER_ROW = 6   # audit action cells per row, one per logged event
+
 _EV_STYLE = {
     "shock":           {"icon": "📣", "label": "Campaign",     "color": "#fef3c7", "border": "#f59e0b"},
     "custom_drag":     {"icon": "🖱️", "label": "DNA Drag",    "color": "#ede9fe", "border": "#7c3aed"},
@@ -24,10 +29,29 @@ _EV_STYLE = {
 }
 
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _drag_periods(proj_key, time_col, _df):
+    """Per-period DNA session-index means and Base / Sim session sums for the DNA Drag
+    tab (indexed by period), in one groupby. Keyed on `proj_key` like the dashboard
+    aggregations, so slider / radio reruns that leave the projection unchanged skip
+    the grouping.
+
+    Grouped sorted (not sort=False): the chart's x-axis is the period number itself,
+    and ISO weeks at the year boundary would otherwise draw out of order.
+    """
+    return _df.groupby(time_col, observed=True).agg(
+        idx_sessions_pure=("idx_sessions_pure", "mean"),
+        idx_sessions_work=("idx_sessions_work", "mean"),
+        Date=("Date", "first"),
+        Sessions_Base=("Sessions_Base", "sum"),
+        Sessions_Sim=("Sessions_Sim", "sum"),
+    )
+
+
 def render_lab(df, df_raw, sel_brands, res_level, time_col,
                base_sessions, base_cr, base_aov,
                adj_sessions, adj_conversions, adj_revenue,
-               t_start, t_end, pure_dna, settings=None):
+               t_start, t_end, pure_dna, proj_key, settings=None):
     """Render the Event Simulation Lab (4 tabs)."""
     if settings is None:
         settings = load_settings()
@@ -55,21 +79,45 @@ def render_lab(df, df_raw, sel_brands, res_level, time_col,
         "📋 Audit & Gap Attribution",
     ])
 
+    # Each tab body is a fragment: its widgets rerun only that tab, so scrubbing a
+    # slider in one tab skips the others' groupbys and the audit's prefix evaluations.
+    # Handlers that edit the event log or library call st.rerun(), which reruns the
+    # whole app, so the banner and the other tabs pick up the change.
     # ── Tab 1: Visual DNA Drag ──────────────────────────────────────────────────
     with t_custom:
-        st.subheader("Interactive DNA Sculpting")
-        dna_plot = df.groupby(time_col).agg({
-            "idx_sessions_pure": "mean",
-            "idx_sessions_work": "mean",
-        }).reset_index()
+        _render_drag(df, proj_key, res_level, time_col)
+
+    # ── Tab 2: Events ───────────────────────────────────────────────────────────
+    with t_events:
+        _render_events(sel_brands, res_level, t_start,
+                       base_sessions, base_cr, base_aov, settings)
+
+    # ── Tab 3: De-Shock Tool ────────────────────────────────────────────────────
+    with t_deshock:
+        _render_deshock(df, df_raw, sel_brands, t_start)
+
+    # ── Tab 4: Audit & Gap Attribution ─────────────────────────────────────────
+    with t_log:
+        _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_start, t_end,
+                      proj_key)
 
+
+# ── Visual DNA Drag ─────────────────────────────────────────────────────────────
+
+@_fragment
+def _render_drag(df, proj_key, res_level, time_col):
+    st.subheader("Interactive DNA Sculpting")
+    dna_plot = _drag_periods(proj_key, time_col, df)
+
+    figs = _reuse_figure("_drag_figs", (proj_key, time_col, res_level))
+    if figs is None:
         fig_i = go.Figure()
         fig_i.add_trace(go.Scatter(
-            x=dna_plot[time_col], y=dna_plot["idx_sessions_pure"],
+            x=dna_plot.index, y=dna_plot["idx_sessions_pure"],
             mode="lines", line=dict(color=_C_BASE, dash="dot"),
             name="Pure DNA (Before)"))
         fig_i.add_trace(go.Scatter(
-            x=dna_plot[time_col], y=dna_plot["idx_sessions_work"],
+            x=dna_plot.index, y=dna_plot["idx_sessions_work"],
             mode="lines+markers", line=dict(color=_C_SIM),
             name="Sculpted DNA (After)"))
         fig_i.update_layout(
@@ -78,160 +126,181 @@ def render_lab(df, df_raw, sel_brands, res_level, time_col,
             yaxis_title="Index (1.0 = median)",
             hovermode="x unified")
 
-        target_idx = None
-        try:
-            sel = st.plotly_chart(
-                fig_i, on_select="rerun", selection_mode="points", key="dna_plot")
-            if sel and sel.get("selection", {}).get("points"):
-                target_idx = sel["selection"]["points"][0]["x"]
-        except TypeError:
-            st.warning("Update Streamlit for visual click dragging.")
+        fig_imp = go.Figure()
+        fig_imp.add_trace(go.Scatter(
+            x=dna_plot["Date"], y=dna_plot["Sessions_Base"],
+            mode="lines", line=dict(color=_C_BASE, dash="dot", width=2), name="Before"))
+        fig_imp.add_trace(go.Scatter(
+            x=dna_plot["Date"], y=dna_plot["Sessions_Sim"],
+            mode="lines+markers", line=dict(color=_C_SIM, width=2), name="After"))
+        fig_imp.update_layout(
+            template=_TMPL, height=260,
+            margin=dict(l=0, r=0, t=30, b=0), hovermode="x unified")
+        figs = (fig_i, fig_imp)
+        st.session_state["_drag_figs"] = ((proj_key, time_col, res_level), figs)
+    fig_i, fig_imp = figs
+
+    target_idx = None
+    try:
+        sel = st.plotly_chart(
+            fig_i, on_select="rerun", selection_mode="points", key="dna_plot")
+        if sel and sel.get("selection", {}).get("points"):
+            target_idx = sel["selection"]["points"][0]["x"]
+    except TypeError:
+        st.warning("Update Streamlit for visual click dragging.")
+
+    st.markdown("---")
+    col_a, col_b, col_sc = st.columns(3)
+    cd_target = col_a.number_input(
+        f"Target {res_level}", min_value=1,
+        value=int(target_idx) if target_idx else 1)
+    cd_lift = col_b.slider("Multiplier (×)", 0.0, 5.0, 1.0, step=0.05)
+    scope_c = col_sc.radio(
+        "When to apply",
+        ["Pre-Trial (affects calibration)", "Post-Trial (projection only)"],
+        key="drag_scope")
+    scope_val = "pre_trial" if "Pre" in scope_c else "post_trial"
+
+    if st.button("🔨 Apply Structural Customization"):
+        st.session_state.event_log.append({
+            "type": "custom_drag", "level": res_level,
+            "target": cd_target, "lift": cd_lift, "scope": scope_val,
+        })
+        st.rerun()
 
+    if st.session_state.event_log:
         st.markdown("---")
-        col_a, col_b, col_sc = st.columns(3)
-        cd_target = col_a.number_input(
-            f"Target {res_level}", min_value=1,
-            value=int(target_idx) if target_idx else 1)
-        cd_lift = col_b.slider("Multiplier (×)", 0.0, 5.0, 1.0, step=0.05)
-        scope_c = col_sc.radio(
-            "When to apply",
-            ["Pre-Trial (affects calibration)", "Post-Trial (projection only)"],
-            key="drag_scope")
-        scope_val = "pre_trial" if "Pre" in scope_c else "post_trial"
-
-        if st.button("🔨 Apply Structural Customization"):
-            st.session_state.event_log.append({
-                "type": "custom_drag", "level": res_level,
-                "target": cd_target, "lift": cd_lift, "scope": scope_val,
-            })
-            st.rerun()
+        st.markdown("##### Forecast Impact (Sessions)")
+        st.plotly_chart(fig_imp, use_container_width=True)
 
-        if st.session_state.event_log:
-            st.markdown("---")
-            st.markdown("##### Forecast Impact (Sessions)")
-            proj_plot = df.groupby(time_col).agg({
-                "Date": "first",
-                "Sessions_Base": "sum",
-                "Sessions_Sim":  "sum",
-            }).reset_index()
-            fig_imp = go.Figure()
-            fig_imp.add_trace(go.Scatter(
-                x=proj_plot["Date"], y=proj_plot["Sessions_Base"],
-                mode="lines", line=dict(color=_C_BASE, dash="dot", width=2), name="Before"))
-            fig_imp.add_trace(go.Scatter(
-                x=proj_plot["Date"], y=proj_plot["Sessions_Sim"],
-                mode="lines+markers", line=dict(color=_C_SIM, width=2), name="After"))
-            fig_imp.update_layout(
-                template=_TMPL, height=260,
-                margin=dict(l=0, r=0, t=30, b=0), hovermode="x unified")
-            st.plotly_chart(fig_imp, use_container_width=True)
 
-    # ── Tab 2: Events ───────────────────────────────────────────────────────────
-    with t_events:
-        col_c, col_s = st.columns(2)
+# ── Events ──────────────────────────────────────────────────────────────────────
 
-        with col_c:
-            st.subheader("Add Time-Bound Campaign")
-            c_start = st.date_input("Start Date", date(t_start.year, 6, 1),  key="ev_start")
-            c_end   = st.date_input("End Date",   date(t_start.year, 6, 15), key="ev_end")
+@_fragment
+def _render_events(sel_brands, res_level, t_start, base_sessions, base_cr, base_aov, settings):
+    col_c, col_s = st.columns(2)
 
-            c_shape = st.selectbox("Campaign Shape", list(EVENT_MAPPING.keys()), key="ev_shape")
+    with col_c:
+        st.subheader("Add Time-Bound Campaign")
+        c_start = st.date_input("Start Date", date(t_start.year, 6, 1),  key="ev_start")
+        c_end   = st.date_input("End Date",   date(t_start.year, 6, 15), key="ev_end")
 
-            _brand_for_default = sel_brands[0] if len(sel_brands) == 1 else "__all__"
-            _default_pct = get_campaign_default(settings, _brand_for_default, c_shape)
+        c_shape = st.selectbox("Campaign Shape", list(EVENT_MAPPING.keys()), key="ev_shape")
 
-            c_str_pct = st.slider(
-                "Traffic Lift (%)",
-                min_value=-100, max_value=300,
-                value=_default_pct, step=5,
-                key=f"ev_str_{c_shape}",
-                help="Default loaded from Settings. Adjust as needed.",
-            )
-            c_str = c_str_pct / 100
+        _brand_for_default = sel_brands[0] if len(sel_brands) == 1 else "__all__"
+        _default_pct = get_campaign_default(settings, _brand_for_default, c_shape)
+
+        c_str_pct = st.slider(
+            "Traffic Lift (%)",
+            min_value=-100, max_value=300,
+            value=_default_pct, step=5,
+            key=f"ev_str_{c_shape}",
+            help="Default loaded from Settings. Adjust as needed.",
+        )
+        c_str = c_str_pct / 100
 
-            if c_str_pct != _default_pct:
-                st.caption(f"Settings default for this shape: **{_default_pct}%**")
+        if c_str_pct != _default_pct:
+            st.caption(f"Settings default for this shape: **{_default_pct}%**")
 
-            st.markdown("##### Shape Preview")
-            sim_d = (c_end - c_start).days + 1
-            if sim_d > 0:
+        st.markdown("##### Shape Preview")
+        sim_d = (c_end - c_start).days + 1
+        if sim_d > 0:
+            fig_p = _reuse_figure("_shape_fig", (c_start, c_end, c_str, c_shape))
+            if fig_p is None:
                 p_df = pd.DataFrame({"Date": pd.date_range(c_start, c_end)})
-                p_df["Multiplier"] = p_df["Date"].apply(
-                    lambda d: get_shock_multiplier(
-                        d, [{"type": "shock", "start": c_start, "end": c_end,
-                              "str": c_str, "shape": c_shape}]))
+                p_df["Multiplier"] = shock_kernel(
+                    {"start": c_start, "end": c_end, "str": c_str, "shape": c_shape})
                 fig_p = px.area(
                     p_df, x="Date", y="Multiplier",
                     title=f"{c_shape} — {c_str*100:.0f}% Lift Profile",
                     color_discrete_sequence=[_C_SIM],
                 )
                 fig_p.update_layout(height=220, margin=dict(l=0, r=0, t=30, b=0))
-                st.plotly_chart(fig_p, use_container_width=True)
+                st.session_state["_shape_fig"] = ((c_start, c_end, c_str, c_shape), fig_p)
+            st.plotly_chart(fig_p, use_container_width=True)
+
+        if st.button("Inject Campaign"):
+            duration  = (c_end - c_start).days + 1
+            est_sess  = round(base_sessions * c_str * duration)
+            est_rev   = round(base_sessions * c_str * duration * base_cr * base_aov, 2)
+            shock = {
+                "type": "shock", "start": c_start, "end": c_end,
+                "str": c_str, "shape": c_shape,
+            }
+            shock["kernel"] = shock_kernel(shock)
+            st.session_state.event_log.append(shock)
+            st.rerun()
 
-            if st.button("Inject Campaign"):
-                duration  = (c_end - c_start).days + 1
-                est_sess  = round(base_sessions * c_str * duration)
-                est_rev   = round(base_sessions * c_str * duration * base_cr * base_aov, 2)
+    with col_s:
+        st.subheader("Swap Time Periods")
+        st.caption(
+            "Pick **any date range** for each period. The engine maps them to the "
+            f"correct {res_level.lower()} indices automatically.")
+
+        sa1, sa2 = st.columns(2)
+        swap_a_start = sa1.date_input("Period A — Start", date(t_start.year, 1, 1),  key="swap_a_start")
+        swap_a_end   = sa2.date_input("Period A — End",   date(t_start.year, 1, 31), key="swap_a_end")
+        sb1, sb2 = st.columns(2)
+        swap_b_start = sb1.date_input("Period B — Start", date(t_start.year, 7, 1),  key="swap_b_start")
+        swap_b_end   = sb2.date_input("Period B — End",   date(t_start.year, 7, 31), key="swap_b_end")
+
+        t_col_swap = "Month" if res_level == "Monthly" else "Week" if res_level == "Weekly" else "DayOfYear"
+        a_periods  = _periods_from_range(swap_a_start, swap_a_end, t_col_swap)
+        b_periods  = _periods_from_range(swap_b_start, swap_b_end, t_col_swap)
+        st.caption(
+            f"A → {res_level} indices: **{list(a_periods)}**  ↔  "
+            f"B → **{list(b_periods)}** ({min(len(a_periods), len(b_periods))} pair(s))")
+
+        swap_sc = st.radio(
+            "When to apply",
+            ["Pre-Trial (affects calibration)", "Post-Trial (projection only)"],
+            key="swap_scope")
+        swap_scope = "pre_trial" if "Pre" in swap_sc else "post_trial"
+
+        if st.button("Execute DNA Swap"):
+            if not a_periods or not b_periods:
+                st.error("Invalid date ranges — no periods found.")
+            else:
                 st.session_state.event_log.append({
-                    "type": "shock", "start": c_start, "end": c_end,
-                    "str": c_str, "shape": c_shape,
+                    "type": "swap", "level": res_level,
+                    "a_start": swap_a_start, "a_end": swap_a_end,
+                    "b_start": swap_b_start, "b_end": swap_b_end,
+                    "scope": swap_scope,
                 })
                 st.rerun()
 
-        with col_s:
-            st.subheader("Swap Time Periods")
-            st.caption(
-                "Pick **any date range** for each period. The engine maps them to the "
-                f"correct {res_level.lower()} indices automatically.")
-
-            sa1, sa2 = st.columns(2)
-            swap_a_start = sa1.date_input("Period A — Start", date(t_start.year, 1, 1),  key="swap_a_start")
-            swap_a_end   = sa2.date_input("Period A — End",   date(t_start.year, 1, 31), key="swap_a_end")
-            sb1, sb2 = st.columns(2)
-            swap_b_start = sb1.date_input("Period B — Start", date(t_start.year, 7, 1),  key="swap_b_start")
-            swap_b_end   = sb2.date_input("Period B — End",   date(t_start.year, 7, 31), key="swap_b_end")
-
-            t_col_swap = "Month" if res_level == "Monthly" else "Week" if res_level == "Weekly" else "DayOfYear"
-            a_periods  = _periods_from_range(swap_a_start, swap_a_end, t_col_swap)
-            b_periods  = _periods_from_range(swap_b_start, swap_b_end, t_col_swap)
-            st.caption(
-                f"A → {res_level} indices: **{a_periods}**  ↔  "
-                f"B → **{b_periods}** ({min(len(a_periods), len(b_periods))} pair(s))")
-
-            swap_sc = st.radio(
-                "When to apply",
-                ["Pre-Trial (affects calibration)", "Post-Trial (projection only)"],
-                key="swap_scope")
-            swap_scope = "pre_trial" if "Pre" in swap_sc else "post_trial"
-
-            if st.button("Execute DNA Swap"):
-                if not a_periods or not b_periods:
-                    st.error("Invalid date ranges — no periods found.")
-                else:
-                    st.session_state.event_log.append({
-                        "type": "swap", "level": res_level,
-                        "a_start": swap_a_start, "a_end": swap_a_end,
-                        "b_start": swap_b_start, "b_end": swap_b_end,
-                        "scope": swap_scope,
-                    })
-                    st.rerun()
 
-    # ── Tab 3: De-Shock Tool ────────────────────────────────────────────────────
-    with t_deshock:
-        _render_deshock(df, df_raw, sel_brands, t_start)
+# ── De-Shock Tool ───────────────────────────────────────────────────────────────
 
-    # ── Tab 4: Audit & Gap Attribution ─────────────────────────────────────────
-    with t_log:
-        _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_start, t_end)
+def _daily_totals(rows, cols):
+    """Per-Date sums of `cols`, indexed by sorted Date, for a small row subset.
 
+    A stable sort on Date and one np.add.reduceat over the run starts, instead of a
+    hashed groupby; input dtypes are kept (integer counts stay integer).
+    """
+    dates  = rows["Date"].to_numpy()
+    order  = np.argsort(dates, kind="stable")
+    dates  = dates[order]
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if len(dates) else order
+    sums   = np.add.reduceat(rows[cols].to_numpy(dtype=float)[order], starts, axis=0)
+    return pd.DataFrame(
+        sums, columns=cols, index=pd.Index(dates[starts], name="Date")
+    ).astype(rows[cols].dtypes)
 
-# ── De-Shock Tool ───────────────────────────────────────────────────────────────
 
+@_fragment
 def _render_deshock(df, df_raw, sel_brands, t_start):
     st.subheader("🧹 Isolate & Extract Historical Shocks")
 
-    available_start = df_raw[df_raw["brand"].isin(sel_brands)]["Date"].min()
-    available_end   = df_raw[df_raw["brand"].isin(sel_brands)]["Date"].max()
+    # brand is categorical (engine.data_store): match the selection on its int codes,
+    # once, and reuse the mask for the available range and the context window.
+    brands     = df_raw["brand"]
+    sel_codes  = brands.cat.categories.get_indexer(sel_brands)
+    brand_mask = np.isin(brands.cat.codes.to_numpy(), sel_codes[sel_codes >= 0])
+
+    brand_dates     = df_raw.loc[brand_mask, "Date"]
+    available_start = brand_dates.min()
+    available_end   = brand_dates.max()
     if pd.isna(available_start):
         st.warning("No raw data available for the selected entities.")
         return
@@ -264,62 +333,57 @@ def _render_deshock(df, df_raw, sel_brands, t_start):
     ctx_end   = ds_end   + timedelta(days=14)
 
     ctx_mask = (
-        df_raw["brand"].isin(sel_brands) &
+        brand_mask &
         (df_raw["Date"] >= pd.Timestamp(ctx_start)) &
         (df_raw["Date"] <= pd.Timestamp(ctx_end))
     )
-    ctx_raw = (
-        df_raw[ctx_mask]
-        .groupby("Date")
-        .agg({"sessions": "sum", "conversions": "sum", "revenue": "sum"})
-        .reset_index()
-    )
+    ctx_raw = _daily_totals(df_raw[ctx_mask], ["sessions", "conversions", "revenue"])
 
     if ctx_raw.empty:
         st.warning("No data found for the selected period. Try a different date range.")
         return
 
-    shock_raw = ctx_raw[
-        (ctx_raw["Date"] >= pd.Timestamp(ds_start)) &
-        (ctx_raw["Date"] <= pd.Timestamp(ds_end))
-    ].copy()
+    # Sorted Date index: the shock window is a label slice, not a mask.
+    shock_raw = ctx_raw.loc[pd.Timestamp(ds_start):pd.Timestamp(ds_end)]
 
     if shock_raw.empty:
         st.warning("No data in the shock window itself.")
         return
 
-    floor_s = shock_raw["sessions"].quantile(0.10)
-    floor_c = shock_raw["conversions"].quantile(0.10)
-    floor_r = shock_raw["revenue"].quantile(0.10)
-
-    shock_raw["delta_s"] = np.maximum(0, shock_raw["sessions"]    - floor_s)
-    shock_raw["delta_c"] = np.maximum(0, shock_raw["conversions"] - floor_c)
-    shock_raw["delta_r"] = np.maximum(0, shock_raw["revenue"]     - floor_r)
-
-    fig_ds = go.Figure()
-    fig_ds.add_trace(go.Scatter(
-        x=ctx_raw["Date"], y=ctx_raw["sessions"],
-        mode="lines", name="Historical Sessions", line=dict(color=_C_BASE)))
-    fig_ds.add_trace(go.Scatter(
-        x=shock_raw["Date"], y=shock_raw["sessions"],
-        mode="lines", showlegend=False, line=dict(color="rgba(0,0,0,0)")))
-    fig_ds.add_trace(go.Scatter(
-        x=shock_raw["Date"], y=[floor_s] * len(shock_raw),
-        mode="lines", fill="tonexty", fillcolor="rgba(33,195,84,0.4)",
-        line=dict(color="rgba(0,0,0,0)"), name="Extracted Shock Delta"))
-    fig_ds.add_trace(go.Scatter(
-        x=[ds_start, ds_end], y=[floor_s, floor_s],
-        mode="lines", name="Organic Floor (10th pct)",
-        line=dict(color="#dc2626", dash="dash")))
-    fig_ds.update_layout(
-        template=_TMPL, height=320,
-        title="De-Shock Isolation (+/- 14-day context window)",
-        hovermode="x unified")
+    # Organic floor (10th pct) and above-floor deltas for all three metrics at once
+    # on the (n, 3) sessions / conversions / revenue block.
+    vals   = shock_raw[["sessions", "conversions", "revenue"]].to_numpy(dtype=float)
+    floors = np.quantile(vals, 0.10, axis=0)
+    deltas = np.maximum(vals - floors, 0.0)
+    pcts   = np.divide(deltas, floors, out=np.zeros_like(deltas), where=floors > 0)
+    floor_s, floor_c, floor_r = floors
+
+    ds_sig = (tuple(sel_brands), ds_start, ds_end)
+    fig_ds = _reuse_figure("_deshock_fig", ds_sig)
+    if fig_ds is None:
+        fig_ds = go.Figure()
+        fig_ds.add_trace(go.Scatter(
+            x=ctx_raw.index, y=ctx_raw["sessions"],
+            mode="lines", name="Historical Sessions", line=dict(color=_C_BASE)))
+        fig_ds.add_trace(go.Scatter(
+            x=shock_raw.index, y=shock_raw["sessions"],
+            mode="lines", showlegend=False, line=dict(color="rgba(0,0,0,0)")))
+        fig_ds.add_trace(go.Scatter(
+            x=shock_raw.index, y=[floor_s] * len(shock_raw),
+            mode="lines", fill="tonexty", fillcolor="rgba(33,195,84,0.4)",
+            line=dict(color="rgba(0,0,0,0)"), name="Extracted Shock Delta"))
+        fig_ds.add_trace(go.Scatter(
+            x=[ds_start, ds_end], y=[floor_s, floor_s],
+            mode="lines", name="Organic Floor (10th pct)",
+            line=dict(color="#dc2626", dash="dash")))
+        fig_ds.update_layout(
+            template=_TMPL, height=320,
+            title="De-Shock Isolation (+/- 14-day context window)",
+            hovermode="x unified")
+        st.session_state["_deshock_fig"] = (ds_sig, fig_ds)
     st.plotly_chart(fig_ds, use_container_width=True)
 
-    tot_delta_s = shock_raw["delta_s"].sum()
-    tot_delta_c = shock_raw["delta_c"].sum()
-    tot_delta_r = shock_raw["delta_r"].sum()
+    tot_delta_s, tot_delta_c, tot_delta_r = deltas.sum(axis=0)
     ds_dur      = (ds_end - ds_start).days + 1
 
     if tot_delta_s <= 0:
@@ -354,12 +418,8 @@ def _render_deshock(df, df_raw, sel_brands, t_start):
             "tot_delta_s": tot_delta_s,
             "tot_delta_c": tot_delta_c,
             "tot_delta_r": tot_delta_r,
-            "daily_abs_s": shock_raw["delta_s"].tolist(),
-            "daily_abs_c": shock_raw["delta_c"].tolist(),
-            "daily_abs_r": shock_raw["delta_r"].tolist(),
-            "daily_pct_s": (shock_raw["delta_s"] / floor_s).fillna(0).tolist() if floor_s > 0 else [0]*len(shock_raw),
-            "daily_pct_c": (shock_raw["delta_c"] / floor_c).fillna(0).tolist() if floor_c > 0 else [0]*len(shock_raw),
-            "daily_pct_r": (shock_raw["delta_r"] / floor_r).fillna(0).tolist() if floor_r > 0 else [0]*len(shock_raw),
+            # (duration, 6): abs sessions/conv/rev, then pct sessions/conv/rev.
+            "daily":       np.hstack([deltas, pcts]),
         })
         st.success(f"'{sig_name}' saved to library.")
         st.rerun()
@@ -370,6 +430,8 @@ def _render_deshock(df, df_raw, sel_brands, t_start):
         st.info("Library is empty. Extract a shock above to get started.")
         return
 
+    # The year frame is in date order: each preview window is a searchsorted slice.
+    days = _day_keys(df["Date"])
     for sig in st.session_state.shock_library:
         with st.expander(
                 f"📦 {sig['name']}  |  {sig['duration']} days  "
@@ -394,31 +456,35 @@ def _render_deshock(df, df_raw, sel_brands, t_start):
                 actual_mode = "Absolute Volume" if "Absolute" in inj_mode else "Relative"
 
                 if st.button("💉 Inject Signature", key=f"inj_{sig['id']}"):
-                    st.session_state.event_log.append({
+                    abs_s, abs_c, abs_r, pct_s, pct_c, pct_r = sig["daily"].T.tolist()
+                    inj = {
                         "type":        "reapplied_shock",
                         "name":        sig["name"],
                         "mode":        actual_mode,
                         "new_start":   inj_date,
                         "duration":    sig["duration"],
-                        "daily_abs_s": sig["daily_abs_s"],
-                        "daily_abs_c": sig["daily_abs_c"],
-                        "daily_abs_r": sig["daily_abs_r"],
-                        "daily_pct_s": sig["daily_pct_s"],
-                        "daily_pct_c": sig["daily_pct_c"],
-                        "daily_pct_r": sig["daily_pct_r"],
-                    })
+                        "daily_abs_s": abs_s,
+                        "daily_abs_c": abs_c,
+                        "daily_abs_r": abs_r,
+                        "daily_pct_s": pct_s,
+                        "daily_pct_c": pct_c,
+                        "daily_pct_r": pct_r,
+                    }
+                    inj["daily"] = injection_block(inj)
+                    st.session_state.event_log.append(inj)
                     st.rerun()
 
             with d2:
                 new_end = inj_date + timedelta(days=sig["duration"] - 1)
-                pmask   = (df["Date"].dt.date >= inj_date) & (df["Date"].dt.date <= new_end)
-                if pmask.sum() > 0:
-                    v_n   = min(pmask.sum(), sig["duration"])
-                    df_pv = df[pmask].iloc[:v_n].copy()
+                lo      = np.searchsorted(days, _day_key(inj_date))
+                hi      = np.searchsorted(days, _day_key(new_end), side="right")
+                if hi > lo:
+                    v_n   = min(hi - lo, sig["duration"])
+                    df_pv = df.iloc[lo:lo + v_n].copy()
                     if actual_mode == "Absolute Volume":
-                        df_pv["Inj"] = np.array(sig["daily_abs_s"][:v_n])
+                        df_pv["Inj"] = sig["daily"][:v_n, 0]
                     else:
-                        df_pv["Inj"] = df_pv["Sessions_Base"] * np.array(sig["daily_pct_s"][:v_n])
+                        df_pv["Inj"] = df_pv["Sessions_Base"].to_numpy() * sig["daily"][:v_n, 3]
                     fig_pv = go.Figure()
                     fig_pv.add_trace(go.Bar(
                         x=df_pv["Date"], y=df_pv["Inj"],
@@ -434,7 +500,32 @@ def _render_deshock(df, df_raw, sel_brands, t_start):
 
 # ── Audit & Gap Attribution ──────────────────────────────────────────────────────
 
-def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_start, t_end):
+@st.cache_data(show_spinner=False, max_entries=256)
+def _eval_subset(events_key, pure_dna, adj_sessions, adj_conversions, adj_revenue,
+                 t_start, t_end, tgt_start, tgt_end, _events):
+    return eval_events(
+        _events, pure_dna=pure_dna,
+        adj_sessions=adj_sessions, adj_conversions=adj_conversions, adj_revenue=adj_revenue,
+        t_start=t_start, t_end=t_end, tgt_start=tgt_start, tgt_end=tgt_end)
+
+
+def _eval_events_cached(ev_subset, **kwargs):
+    """eval_events memoised across reruns, keyed on a JSON dump of the event subset
+    (as app._run_projection does), so an appended event only evaluates the new prefix."""
+    return _eval_subset(json.dumps(ev_subset, default=str, sort_keys=True),
+                        _events=ev_subset, **kwargs)
+
+
+def _target_sum(df, col, tgt_start, tgt_end):
+    """Sum of df[col] over the target period, masked on int64 day keys."""
+    days = _day_keys(df["Date"])
+    mask = (days >= _day_key(tgt_start)) & (days <= _day_key(tgt_end))
+    return df[col].to_numpy()[mask].sum()
+
+
+@_fragment
+def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_start, t_end,
+                  proj_key):
     st.subheader("Simulation Audit & Gap Attribution")
 
     if not st.session_state.event_log:
@@ -446,20 +537,28 @@ def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_st
         if st.session_state.target_metric in ["CR", "AOV"]
         else st.session_state.target_metric
     )
-    base_vol = eval_events(
-        [],
-        pure_dna=pure_dna,
-        adj_sessions=adj_sessions, adj_conversions=adj_conversions, adj_revenue=adj_revenue,
-        t_start=t_start, t_end=t_end,
-        tgt_start=st.session_state.tgt_start, tgt_end=st.session_state.tgt_end,
-    )[tgt_met]
+    # Target-period volume after each prefix of the log; vols[0] is the organic base.
+    # proj_key covers the log and every projection input, so while it and the target
+    # window are unchanged the session's last result is reused without any lookups.
+    audit_key = (proj_key, st.session_state.tgt_start, st.session_state.tgt_end, tgt_met)
+    hit = st.session_state.get("_audit_vols")
+    if hit is not None and hit[0] == audit_key:
+        vols = hit[1]
+    else:
+        vols = [v[tgt_met] for v in eval_prefixes(
+            st.session_state.event_log, evaluate=_eval_events_cached,
+            pure_dna=pure_dna,
+            adj_sessions=adj_sessions, adj_conversions=adj_conversions, adj_revenue=adj_revenue,
+            t_start=t_start, t_end=t_end,
+            tgt_start=st.session_state.tgt_start, tgt_end=st.session_state.tgt_end,
+        )]
+        st.session_state["_audit_vols"] = (audit_key, vols)
+    base_vol = vols[0]
     needed_vol = (
         st.session_state.target_val
         if tgt_met == st.session_state.target_metric
-        else df[
-            (df["Date"].dt.date >= st.session_state.tgt_start) &
-            (df["Date"].dt.date <= st.session_state.tgt_end)
-        ][f"{tgt_met}_Base"].sum()
+        else _target_sum(df, f"{tgt_met}_Base",
+                         st.session_state.tgt_start, st.session_state.tgt_end)
     )
     total_gap = needed_vol - base_vol if (needed_vol - base_vol) != 0 else 1.0
 
@@ -469,24 +568,13 @@ def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_st
     )
     st.markdown("---")
 
+    # All event cards go out as one markdown element; each event's Shift / ❌ actions
+    # follow in a grid of cells headed by the card's number.
+    cards, labels = [], []
     for i, ev in enumerate(st.session_state.event_log):
         sty = _EV_STYLE.get(ev["type"], {"icon": "•", "label": ev["type"],
                                           "color": "#f1f5f9", "border": "#64748b"})
-        vol_prev = eval_events(
-            st.session_state.event_log[:i],
-            pure_dna=pure_dna,
-            adj_sessions=adj_sessions, adj_conversions=adj_conversions, adj_revenue=adj_revenue,
-            t_start=t_start, t_end=t_end,
-            tgt_start=st.session_state.tgt_start, tgt_end=st.session_state.tgt_end,
-        )[tgt_met]
-        vol_curr = eval_events(
-            st.session_state.event_log[:i + 1],
-            pure_dna=pure_dna,
-            adj_sessions=adj_sessions, adj_conversions=adj_conversions, adj_revenue=adj_revenue,
-            t_start=t_start, t_end=t_end,
-            tgt_start=st.session_state.tgt_start, tgt_end=st.session_state.tgt_end,
-        )[tgt_met]
-        added   = vol_curr - vol_prev
+        added   = vols[i + 1] - vols[i]
         pct_gap = (added / total_gap) * 100 if total_gap else 0
 
         if ev["type"] == "shock":
@@ -510,7 +598,8 @@ def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_st
         delta_color = "#16a34a" if added >= 0 else "#dc2626"
         sign        = "+" if added >= 0 else ""
 
-        st.markdown(
+        labels.append(f"#{i + 1} {sty['icon']} {sty['label']}")
+        cards.append(
             f"""<div style="
                 background:{sty['color']};
                 border-left:4px solid {sty['border']};
@@ -518,28 +607,29 @@ def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_st
                 display:flex; align-items:center; gap:12px;">
               <span style="font-size:1.3em">{sty['icon']}</span>
               <div style="flex:1">
-                <strong>{sty['label']}</strong>
+                <strong>#{i + 1} {sty['label']}</strong>
                 <span style="color:#475569;font-size:0.9em;margin-left:8px">{desc}</span>
                 <span style="color:#94a3b8;font-size:0.82em;margin-left:8px">({scope_txt})</span>
               </div>
               <span style="color:{delta_color};font-weight:700;font-size:1.05em">
                 {sign}{added:,.0f} ({pct_gap:.1f}%)
               </span>
-            </div>""",
-            unsafe_allow_html=True,
-        )
-
-        act1, act2, act3 = st.columns([1, 1, 6])
-        if ev["type"] == "shock":
-            if act1.button("↔ Shift", key=f"shift_{i}"):
-                st.session_state.shift_target_idx = i
+            </div>""")
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+    n_ev = len(labels)
+    for lo in range(0, n_ev, _ACTIONS_PER_ROW):
+        cells = st.columns(_ACTIONS_PER_ROW)
+        for i, cell in zip(range(lo, min(lo + _ACTIONS_PER_ROW, n_ev)), cells):
+            cell.caption(labels[i])
+            if st.session_state.event_log[i]["type"] == "shock":
+                if cell.button("↔ Shift", key=f"shift_{i}"):
+                    st.session_state.shift_target_idx = i
+                    st.rerun()
+            if cell.button("❌", key=f"del_{i}"):
+                st.session_state.event_log.pop(i)
+                st.session_state.shift_target_idx = None
                 st.rerun()
-        else:
-            act1.write("")
-        if act2.button("❌", key=f"del_{i}"):
-            st.session_state.event_log.pop(i)
-            st.session_state.shift_target_idx = None
-            st.rerun()
 
     if st.session_state.shift_target_idx is not None:
         idx_s = st.session_state.shift_target_idx
@@ -551,8 +641,9 @@ def _render_audit(df, pure_dna, adj_sessions, adj_conversions, adj_revenue, t_st
             new_start_s = st.date_input("New Start Date", ev_s["start"], key="shift_new_start")
             sc1, sc2 = st.columns(2)
             if sc1.button("✅ Confirm Shift"):
-                st.session_state.event_log[idx_s]["start"] = new_start_s
-                st.session_state.event_log[idx_s]["end"]   = new_start_s + timedelta(days=dur_s)
+                st.session_state.event_log[idx_s]["start"]  = new_start_s
+                st.session_state.event_log[idx_s]["end"]    = new_start_s + timedelta(days=dur_s)
+                st.session_state.event_log[idx_s]["kernel"] = shock_kernel(ev_s)
                 st.session_state.shift_target_idx = None
                 st.rerun()
             if sc2.button("✖ Cancel"):
@@ -18,6 +18,13 @@ from engine.settings_store import load_settings, save_settings
 _SHAPES = list(EVENT_MAPPING.keys())
 
 
+@st.cache_data(show_spinner=False)
+def _profile_brands(mtime):
+    """Sorted entity names in the profiles CSV; `mtime` re-reads it when the file changes."""
+    profiles = pd.read_csv(PROFILES_PATH, usecols=["brand"])
+    return sorted(profiles["brand"].str.strip().str.lower().unique())
+
+
 def render_settings():
     settings = load_settings()
 
@@ -27,22 +34,20 @@ def render_settings():
         "These values pre-populate the slider in the Simulation Lab when you select a shape.")
 
     try:
-        profiles   = pd.read_csv(PROFILES_PATH)
-        all_brands = sorted(profiles["brand"].str.strip().str.lower().unique())
+        all_brands = _profile_brands(os.path.getmtime(PROFILES_PATH))
     except Exception:
         all_brands = []
 
     cd = settings.get("campaign_defaults", {"__all__": {s: 25 for s in _SHAPES}})
 
-    rows = []
-    for b in ["__all__"] + all_brands:
-        label = "Global Default" if b == "__all__" else b.title()
-        row   = {"Entity": label}
-        for shape in _SHAPES:
-            row[shape] = int(cd.get(b, cd.get("__all__", {})).get(shape, 25))
-        rows.append(row)
-
-    df_defaults = pd.DataFrame(rows)
+    # (entities × shapes) table in one frame build: an entity without its own entry
+    # shows the global row, a missing shape shows 25.
+    entities = ["__all__"] + all_brands
+    glob     = cd.get("__all__", {})
+    values   = (pd.DataFrame.from_dict({b: cd.get(b, glob) for b in entities}, orient="index")
+                  .reindex(index=entities, columns=_SHAPES).fillna(25).astype(int))
+    df_defaults = values.set_axis(
+        ["Global Default"] + [b.title() for b in all_brands]).rename_axis("Entity").reset_index()
 
     col_cfg = {"Entity": st.column_config.TextColumn("Entity", disabled=True)}
     for shape in _SHAPES:
@@ -74,25 +79,19 @@ def render_settings():
 
     with col_save:
         if st.button("Save Settings", type="primary", use_container_width=True):
-            new_cd = {}
-            for _, row in edited.iterrows():
-                label = row["Entity"]
-                key   = "__all__" if label == "Global Default" else label.lower()
-                new_cd[key] = {s: int(row[s]) for s in _SHAPES}
+            keys = ["__all__" if label == "Global Default" else label.lower()
+                    for label in edited["Entity"]]
+            new_cd = {key: dict(zip(_SHAPES, row))
+                      for key, row in zip(keys, edited[_SHAPES].to_numpy(dtype=int).tolist())}
             settings["campaign_defaults"] = new_cd
             save_settings(settings)
             st.success("Settings saved.")
             st.rerun()
 
     with st.expander("Current effective defaults per entity"):
-        preview_rows = []
-        for b in all_brands:
-            row = {"Entity": b.title()}
-            for s in _SHAPES:
-                val = int(cd.get(b, cd.get("__all__", {})).get(s, 25))
-                row[s] = f"{val}%"
-            preview_rows.append(row)
-        if preview_rows:
-            st.dataframe(pd.DataFrame(preview_rows), use_container_width=True, hide_index=True)
+        if all_brands:
+            preview = df_defaults.iloc[1:]
+            st.dataframe(preview[["Entity"]].join(preview[_SHAPES].astype(str) + "%"),
+                         use_container_width=True, hide_index=True)
         else:
             st.info("No entities loaded yet.")